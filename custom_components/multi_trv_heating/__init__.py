@@ -63,6 +63,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Clean up controller and listeners
     if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
-        del hass.data[DOMAIN][entry.entry_id]
+        controller = hass.data[DOMAIN].pop(entry.entry_id)
+        controller.pump_discharge.async_teardown()
     
     return unload_ok
@@ -25,7 +25,7 @@ SOFTWARE.
 import logging
 import asyncio
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 try:
     from homeassistant.helpers.event import async_track_state_change_event
@@ -93,6 +93,10 @@ class MasterController:
         # Current OpenTherm flow temperature request (for sensor reporting)
         self.current_flow_temp: float = MIN_FLOW_TEMP
         
+        # ========== State Listeners ==========
+        # Callbacks (e.g. sensor entities) notified after zone/controller state changes
+        self._listeners: list[Callable[[], None]] = []
+        
         _LOGGER.info("MasterController initializing with %d zones", len(zone_configs))
         
         # Instantiate ZoneWrapper for each configured zone
@@ -205,8 +209,14 @@ class MasterController:
             zone.update_from_state(new_state)
             _LOGGER.debug("Zone '%s' updated from climate entity", zone.name)
         
+        # Publish the zone update now; the boiler command may wait or fail
+        self.async_update_listeners()
+        
         # Recalculate boiler command
-        await self._calculate_and_command()
+        try:
+            await self._calculate_and_command()
+        finally:
+            self.async_update_listeners()
     
     async def _async_position_change(self, event) -> None:
         """
@@ -237,7 +247,10 @@ class MasterController:
                 try:
                     # Extract opening percentage from sensor state
                     opening_percent = float(new_state.state)
-                    if zone.update_trv_opening(opening_percent):
+                    update_offset = zone.update_trv_opening(opening_percent)
+                    # Publish the zone update now; the service calls below may wait or fail
+                    self.async_update_listeners()
+                    if update_offset:
                         # Need to update temperature offset in zone
                         await self.hass.services.async_call(
                             "number",
@@ -264,7 +277,10 @@ class MasterController:
                 break
         
         # Recalculate boiler command
-        await self._calculate_and_command()
+        try:
+            await self._calculate_and_command()
+        finally:
+            self.async_update_listeners()
     
     async def _async_external_temp_change(self, event) -> None:
         """
@@ -306,7 +322,32 @@ class MasterController:
                         entity_id, new_state.state, e
                     )
                 break
+        
+        self.async_update_listeners()
 
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback to run after zone or controller state changes.
+        
+        Args:
+            update_callback: Callback without arguments, run in the event loop
+            
+        Returns:
+            Callable that removes the listener again
+        """
+        self._listeners.append(update_callback)
+        
+        def remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+        
+        return remove_listener
+    
+    def async_update_listeners(self) -> None:
+        """Notify all registered listeners that state may have changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
+    
     def _is_preheating(self) -> bool:
         """Check if pre-heating mode is currently active. Delegates to PreheatingController."""
         return self.preheating.is_active()
@@ -338,7 +379,10 @@ class MasterController:
             _LOGGER.info("Component disabled - skipping boiler calculation")
             return
         
-        _LOGGER.debug("Calculating boiler command from %d zones", len(self.zones))
+        # Per-zone debug lines below are skipped entirely unless DEBUG is enabled
+        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            _LOGGER.debug("Calculating boiler command from %d zones", len(self.zones))
         
         # ========== Track high-priority zone demand ==========
         high_priority_demanding = False  # Is any high-priority zone demanding?
@@ -353,10 +397,11 @@ class MasterController:
         for zone in self.zones.values():
             # Skip discharge TRV - it shouldn't influence boiler control
             if self.pump_discharge.is_discharge_valve(zone.entity_id):
-                _LOGGER.debug(
-                    "Zone '%s' is discharge valve - excluding from boiler calculations",
-                    zone.name
-                )
+                if debug_enabled:
+                    _LOGGER.debug(
+                        "Zone '%s' is discharge valve - excluding from boiler calculations",
+                        zone.name
+                    )
                 continue
             
             demand = zone.get_demand_metric()
@@ -365,10 +410,11 @@ class MasterController:
                 # High priority: Can trigger boiler at any opening > 0%
                 if zone.is_demanding_heat:
                     high_priority_demanding = True
-                    _LOGGER.debug(
-                        "High-priority zone '%s' is demanding heat (opening=%.0f%%)",
-                        zone.name, zone.trv_opening_percent
-                    )
+                    if debug_enabled:
+                        _LOGGER.debug(
+                            "High-priority zone '%s' is demanding heat (opening=%.0f%%)",
+                            zone.name, zone.trv_opening_percent
+                        )
                 high_priority_demand = max(high_priority_demand, demand)
             else:
                 # Low priority: Track for aggregation
@@ -377,10 +423,11 @@ class MasterController:
                 low_priority_count += 1
                 low_priority_max_demand = max(low_priority_max_demand, demand)
                 
-                _LOGGER.debug(
-                    "Low-priority zone '%s': opening=%.0f%% (running aggregate=%.0f%%)",
-                    zone.name, zone.trv_opening_percent, low_priority_aggregate
-                )
+                if debug_enabled:
+                    _LOGGER.debug(
+                        "Low-priority zone '%s': opening=%.0f%% (running aggregate=%.0f%%)",
+                        zone.name, zone.trv_opening_percent, low_priority_aggregate
+                    )
         
         # ========== Determine if boiler should be ON or OFF ==========
         boiler_should_be_on = False
@@ -510,6 +557,25 @@ class MasterController:
             "pump_discharge": self.pump_discharge.get_discharge_state(),
         }
     
+    def get_controller_value(self, key: str):
+        """
+        Return a single value from get_controller_state().
+        
+        The scalar metrics are read directly so that sensors do not export
+        every zone's state just to show the zone count or flow temperature.
+        
+        Args:
+            key: Key of the get_controller_state() dict
+            
+        Returns:
+            The metric value, or None if the key is unknown
+        """
+        if key == "zone_count":
+            return len(self.zones)
+        if key == "current_flow_temp":
+            return self.current_flow_temp
+        return self.get_controller_state().get(key)
+    
     def get_zone_state(self, entity_id: str) -> Optional[dict]:
         zone = self.zones.get(entity_id)
         if zone:
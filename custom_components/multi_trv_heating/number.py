@@ -5,34 +5,34 @@ Provides number entities for configuring zone-specific settings like floor area.
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Any
 
 try:
-    from homeassistant.components.number import NumberEntity, NumberMode
+    from homeassistant.components.number import NumberEntity
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.const import UnitOfArea
-    from homeassistant.core import HomeAssistant, callback
+    from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
-    from homeassistant.helpers.typing import ConfigType
     from homeassistant.helpers.device_registry import DeviceInfo
+    _UNIT_AREA = UnitOfArea.SQUARE_METERS
 except ImportError:
     # For testing without Home Assistant
     NumberEntity = object
-    NumberMode = None
-    UnitOfArea = "m²"
+    _UNIT_AREA = "m²"
     HomeAssistant = None
     AddEntitiesCallback = None
-    ConfigType = None
     ConfigEntry = None
     DeviceInfo = None
 
+from . import DOMAIN
+from .preheating import clamp
 from .storage import get_storage
 
 _LOGGER = logging.getLogger("don_controller")
 
 
-class MultiTRVHeatingNumber(NumberEntity if NumberEntity != object else object):
+class MultiTRVHeatingNumber(NumberEntity):
     """Base number class for MultiTRVHeating control entities."""
     
     def __init__(self, name: str, unique_id: str, icon: Optional[str] = None,
@@ -85,8 +85,7 @@ class ZoneAreaNumber(MultiTRVHeatingNumber):
             hass: Home Assistant instance for state restoration
         """
         name = f"{zone_name} Floor Area"
-        zone_name_lower = zone_name.lower().replace(" ", "_")
-        unique_id = f"multi_trv_{zone_name_lower}_area_m2"
+        unique_id = f"multi_trv_{zone.slug}_area_m2"
         
         if entry_id:
             prefixed_id = f"{entry_id}_{unique_id}"
@@ -94,13 +93,11 @@ class ZoneAreaNumber(MultiTRVHeatingNumber):
             prefixed_id = unique_id
         
         # Floor area range: 0-500 m², step 0.1
-        # Convert UnitOfArea enum to string if needed
-        unit_str = UnitOfArea.value if hasattr(UnitOfArea, 'value') else str(UnitOfArea) if UnitOfArea else "m²"
         super().__init__(
             name,
             prefixed_id,
             icon="mdi:ruler-square",
-            unit=unit_str,
+            unit=_UNIT_AREA,
             min_val=0.0,
             max_val=500.0,
             step=0.1,
@@ -109,22 +106,27 @@ class ZoneAreaNumber(MultiTRVHeatingNumber):
         self.zone = zone
         self.zone_entity_id = zone_entity_id
         self.hass = hass
+        self._storage = get_storage()
         
-        # Restore state from storage if available
-        storage = get_storage()
-        if storage:
-            stored_value = storage.get(f"zone_floor_area_{prefixed_id}")
-            if stored_value is not None:
-                try:
-                    self.zone.floor_area_m2 = max(0.0, min(500.0, float(stored_value)))
-                    self._attr_native_value = self.zone.floor_area_m2
-                    _LOGGER.info("Restored zone %s floor area from storage: %.2f m²", zone_name, self.zone.floor_area_m2)
-                except (ValueError, TypeError):
-                    self._attr_native_value = zone.floor_area_m2 if zone else 0.0
-            else:
-                self._attr_native_value = zone.floor_area_m2 if zone else 0.0
-        else:
-            self._attr_native_value = zone.floor_area_m2 if zone else 0.0
+        self._attr_native_value = zone.floor_area_m2 if zone else 0.0
+    
+    async def async_added_to_hass(self) -> None:
+        """Restore floor area from storage once the entity is registered."""
+        await super().async_added_to_hass()
+        if not self._storage or not self.zone:
+            return
+        stored_value = self._storage.get(f"zone_floor_area_{self._attr_unique_id}")
+        if stored_value is None:
+            return
+        try:
+            self.zone.floor_area_m2 = clamp(float(stored_value), 0.0, 500.0)
+            self._attr_native_value = self.zone.floor_area_m2
+            # Let push-based entities (e.g. floor area sensor) pick up the restored value
+            if self.zone.master_controller is not None:
+                self.zone.master_controller.async_update_listeners()
+            _LOGGER.info("Restored zone %s floor area from storage: %.2f m²", self.zone.name, self.zone.floor_area_m2)
+        except (ValueError, TypeError):
+            pass
     
     @property
     def native_value(self) -> Optional[float]:
@@ -134,13 +136,19 @@ class ZoneAreaNumber(MultiTRVHeatingNumber):
     async def async_set_native_value(self, value: float) -> None:
         """Set floor area value."""
         if self.zone:
-            self.zone.floor_area_m2 = max(0.0, min(500.0, value))
+            area = clamp(value, 0.0, 500.0)
+            # HA may re-send the current value; nothing to update or persist
+            if abs(area - self.zone.floor_area_m2) < self._attr_native_step / 2:
+                return
+            self.zone.floor_area_m2 = area
             self._attr_native_value = self.zone.floor_area_m2
             self.async_write_ha_state()
+            # Let push-based entities (e.g. floor area sensor) pick up the change
+            if self.zone.master_controller is not None:
+                self.zone.master_controller.async_update_listeners()
             # Persist state to storage
-            storage = get_storage()
-            if storage:
-                await storage.async_set_and_save(f"zone_floor_area_{self._attr_unique_id}", self.zone.floor_area_m2)
+            if self._storage:
+                self._storage.async_set_and_delay_save(f"zone_floor_area_{self._attr_unique_id}", self.zone.floor_area_m2)
             _LOGGER.info("Set zone %s floor area to %.2f m²", self.zone.name, self.zone.floor_area_m2)
 
 
@@ -184,29 +192,30 @@ class PreheatingEndTimeHour(MultiTRVHeatingNumber):
         )
         self.controller = controller
         self.hass = hass
+        self._storage = get_storage()
         
-        # Initialize with current hour, but restore from storage if available
-        now = datetime.now()
-        storage = get_storage()
-        if storage:
-            stored_hour = storage.get(f"preheating_end_hour_{prefixed_id}")
-            if stored_hour is not None:
-                try:
-                    hour = int(float(stored_hour))
-                    # Restore the preheating end time with this hour
-                    minute = self.controller.preheating.preheating_end_time.minute if self.controller.preheating.preheating_end_time else 0
-                    new_end_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if new_end_time <= now:
-                        new_end_time += timedelta(days=1)
-                    self.controller.preheating.preheating_end_time = new_end_time
-                    self._attr_native_value = float(hour)
-                    _LOGGER.info("Restored preheating end hour from storage: %d", hour)
-                except (ValueError, AttributeError):
-                    self._attr_native_value = float(now.hour)
-            else:
-                self._attr_native_value = float(now.hour)
-        else:
-            self._attr_native_value = float(now.hour)
+        # Initialize with current hour; stored value is restored in async_added_to_hass
+        self._attr_native_value = float(datetime.now().hour)
+    
+    async def async_added_to_hass(self) -> None:
+        """Restore preheating end hour from storage once the entity is registered."""
+        await super().async_added_to_hass()
+        if not self._storage:
+            return
+        stored_hour = self._storage.get(f"preheating_end_hour_{self._attr_unique_id}")
+        if stored_hour is None:
+            return
+        try:
+            hour = int(float(stored_hour))
+            existing = self.controller.preheating.preheating_end_time
+            # Restore the preheating end time with this hour, unless it is already upcoming
+            if not (existing and existing > datetime.now() and existing.hour == hour):
+                minute = existing.minute if existing else 0
+                self.controller.preheating.set_end_time_of_day(hour, minute)
+            self._attr_native_value = float(hour)
+            _LOGGER.info("Restored preheating end hour from storage: %d", hour)
+        except (ValueError, AttributeError):
+            pass
     
     @property
     def native_value(self) -> Optional[float]:
@@ -218,28 +227,22 @@ class PreheatingEndTimeHour(MultiTRVHeatingNumber):
     async def async_set_native_value(self, value: float) -> None:
         """Set preheating end hour."""
         hour = int(value)
+        end_time = self.controller.preheating.preheating_end_time
         
-        # Get current minute from preheating_end_time or from now
-        if self.controller.preheating.preheating_end_time:
-            minute = self.controller.preheating.preheating_end_time.minute
-        else:
-            minute = datetime.now().minute
-        
-        # Create new end time with updated hour
-        now = datetime.now()
-        new_end_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        # Unchanged upcoming end time: nothing to update or persist
+        if end_time and end_time.hour == hour and end_time > datetime.now():
+            return
         
-        # If the time is in the past, move to next day
-        if new_end_time <= now:
-            new_end_time += timedelta(days=1)
+        # Get current minute from preheating_end_time or from now
+        minute = end_time.minute if end_time else datetime.now().minute
         
-        self.controller.preheating.preheating_end_time = new_end_time
+        # Create new end time with updated hour (moved to next day if already past)
+        self.controller.preheating.set_end_time_of_day(hour, minute)
         self._attr_native_value = float(hour)
         self.async_write_ha_state()
         # Persist state to storage
-        storage = get_storage()
-        if storage:
-            await storage.async_set_and_save(f"preheating_end_hour_{self._attr_unique_id}", hour)
+        if self._storage:
+            self._storage.async_set_and_delay_save(f"preheating_end_hour_{self._attr_unique_id}", hour)
         _LOGGER.info("Set preheating end time to %02d:%02d", hour, minute)
 
 
@@ -283,29 +286,30 @@ class PreheatingEndTimeMinute(MultiTRVHeatingNumber):
         )
         self.controller = controller
         self.hass = hass
+        self._storage = get_storage()
         
-        # Initialize with current minute, but restore from storage if available
-        now = datetime.now()
-        storage = get_storage()
-        if storage:
-            stored_minute = storage.get(f"preheating_end_minute_{prefixed_id}")
-            if stored_minute is not None:
-                try:
-                    minute = int(float(stored_minute))
-                    # Restore the preheating end time with this minute
-                    hour = self.controller.preheating.preheating_end_time.hour if self.controller.preheating.preheating_end_time else datetime.now().hour
-                    new_end_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if new_end_time <= now:
-                        new_end_time += timedelta(days=1)
-                    self.controller.preheating.preheating_end_time = new_end_time
-                    self._attr_native_value = float(minute)
-                    _LOGGER.info("Restored preheating end minute from storage: %d", minute)
-                except (ValueError, AttributeError):
-                    self._attr_native_value = float(now.minute)
-            else:
-                self._attr_native_value = float(now.minute)
-        else:
-            self._attr_native_value = float(now.minute)
+        # Initialize with current minute; stored value is restored in async_added_to_hass
+        self._attr_native_value = float(datetime.now().minute)
+    
+    async def async_added_to_hass(self) -> None:
+        """Restore preheating end minute from storage once the entity is registered."""
+        await super().async_added_to_hass()
+        if not self._storage:
+            return
+        stored_minute = self._storage.get(f"preheating_end_minute_{self._attr_unique_id}")
+        if stored_minute is None:
+            return
+        try:
+            minute = int(float(stored_minute))
+            existing = self.controller.preheating.preheating_end_time
+            # Restore the preheating end time with this minute, unless it is already upcoming
+            if not (existing and existing > datetime.now() and existing.minute == minute):
+                hour = existing.hour if existing else datetime.now().hour
+                self.controller.preheating.set_end_time_of_day(hour, minute)
+            self._attr_native_value = float(minute)
+            _LOGGER.info("Restored preheating end minute from storage: %d", minute)
+        except (ValueError, AttributeError):
+            pass
     
     @property
     def native_value(self) -> Optional[float]:
@@ -317,28 +321,22 @@ class PreheatingEndTimeMinute(MultiTRVHeatingNumber):
     async def async_set_native_value(self, value: float) -> None:
         """Set preheating end minute."""
         minute = int(value)
+        end_time = self.controller.preheating.preheating_end_time
         
-        # Get current hour from preheating_end_time or from now
-        if self.controller.preheating.preheating_end_time:
-            hour = self.controller.preheating.preheating_end_time.hour
-        else:
-            hour = datetime.now().hour
-        
-        # Create new end time with updated minute
-        now = datetime.now()
-        new_end_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        # Unchanged upcoming end time: nothing to update or persist
+        if end_time and end_time.minute == minute and end_time > datetime.now():
+            return
         
-        # If the time is in the past, move to next day
-        if new_end_time <= now:
-            new_end_time += timedelta(days=1)
+        # Get current hour from preheating_end_time or from now
+        hour = end_time.hour if end_time else datetime.now().hour
         
-        self.controller.preheating.preheating_end_time = new_end_time
+        # Create new end time with updated minute (moved to next day if already past)
+        self.controller.preheating.set_end_time_of_day(hour, minute)
         self._attr_native_value = float(minute)
         self.async_write_ha_state()
         # Persist state to storage
-        storage = get_storage()
-        if storage:
-            await storage.async_set_and_save(f"preheating_end_minute_{self._attr_unique_id}", minute)
+        if self._storage:
+            self._storage.async_set_and_delay_save(f"preheating_end_minute_{self._attr_unique_id}", minute)
         _LOGGER.info("Set preheating end time to %02d:%02d", hour, minute)
 
 
@@ -355,14 +353,13 @@ async def async_setup_entry(
         entry: Config entry for this integration
         async_add_entities: Callback to add entities
     """
-    from . import DOMAIN
-    
     # Get the controller instance
-    if entry.entry_id not in hass.data.get(DOMAIN, {}):
+    domain_data = hass.data.get(DOMAIN)
+    if not domain_data or entry.entry_id not in domain_data:
         _LOGGER.error("No controller found for entry %s", entry.entry_id)
         return
     
-    controller = hass.data[DOMAIN][entry.entry_id]
+    controller = domain_data[entry.entry_id]
     
     numbers = []
     
@@ -383,30 +380,32 @@ async def async_setup_entry(
     numbers.append(preheating_minute)
     _LOGGER.debug("Created preheating time control entities")
     
-    # Create area number for each zone
-    for zone_entity_id, zone in controller.zones.items():
-        # Create device info for this zone
-        device_id = f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}"
-        device_info = None
-        if DeviceInfo is not None:
-            device_info = DeviceInfo(
-                identifiers={("multi_trv_heating", device_id)},
+    # Create device info for each zone up front (same identifiers as sensor.py)
+    zone_device_infos = {}
+    if DeviceInfo is not None:  # Only if running with Home Assistant
+        zone_device_infos = {
+            zone_entity_id: DeviceInfo(
+                identifiers={("multi_trv_heating", f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}")},
                 name=zone.name,
                 manufacturer="Multi-TRV Heating",
                 model="Zone Controller",
             )
-        
+            for zone_entity_id, zone in controller.zones.items()
+        }
+    
+    # Create area number for each zone
+    for zone_entity_id, zone in controller.zones.items():
         number = ZoneAreaNumber(
             zone.name,
             zone_entity_id,
             zone,
             entry.entry_id,
-            device_info,
+            zone_device_infos.get(zone_entity_id),
             hass
         )
         numbers.append(number)
         _LOGGER.debug("Created area number for zone: %s", zone.name)
     
     if numbers:
-        async_add_entities(numbers, update_before_add=True)
+        async_add_entities(numbers)
         _LOGGER.info("Set up %d MultiTRVHeating numbers for entry %s", len(numbers), entry.entry_id)
@@ -23,7 +23,8 @@ SOFTWARE.
 """
 
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
@@ -49,6 +50,16 @@ MAX_FLOW_TEMP = 80.0
 PREHEATING_TUNING_CONSTANT = 1.0  # Can be tuned empirically
 
 
+def clamp(value: float, low: float, high: float) -> float:
+    """
+    Return value limited to the range [low, high].
+    
+    The lower bound is tested as "not >=" so that NaN maps to low
+    instead of passing through.
+    """
+    return low if not (value >= low) else high if value > high else value
+
+
 class PreheatingController:
     """
     Manages pre-heating mode for the multi-zone heating system.
@@ -62,6 +73,13 @@ class PreheatingController:
     3. When time expires or is cleared, falls back to normal demand-based control
     """
     
+    __slots__ = (
+        "master_controller",
+        "_preheating_end_time",
+        "_end_timestamp",
+        "is_enabled",
+    )
+    
     def __init__(self, master_controller: "MasterController") -> None:
         """
         Initialize pre-heating controller.
@@ -72,11 +90,50 @@ class PreheatingController:
         self.master_controller = master_controller
         
         # Current pre-heating end time (None = not preheating)
-        self.preheating_end_time: Optional[datetime] = None
+        # Mirrored as a POSIX timestamp in _end_timestamp by the property setter
+        self._preheating_end_time: Optional[datetime] = None
+        self._end_timestamp: Optional[float] = None
 
         # Initialise it as disabled
         self.is_enabled: bool = False
     
+    @property
+    def preheating_end_time(self) -> Optional[datetime]:
+        """Return the pre-heating end time (None = not preheating)."""
+        return self._preheating_end_time
+    
+    @preheating_end_time.setter
+    def preheating_end_time(self, value: Optional[datetime]) -> None:
+        """
+        Set the pre-heating end time and cache it as a POSIX timestamp.
+        
+        Remaining time is measured against time.time(), so it follows the
+        wall-clock HH:MM shown on the number entities, even across clock steps
+        (e.g. NTP correction at boot on boards without an RTC, or resume from suspend).
+        """
+        self._preheating_end_time = value
+        self._end_timestamp = None if value is None else value.timestamp()
+    
+    def set_end_time_of_day(self, hour: int, minute: int) -> datetime:
+        """
+        Set the pre-heating end time to the next occurrence of hour:minute.
+        
+        If that time has already passed today, the end time moves to tomorrow.
+        
+        Args:
+            hour: Hour of day (0-23)
+            minute: Minute of hour (0-59)
+        
+        Returns:
+            datetime: The new pre-heating end time
+        """
+        now = datetime.now()
+        end_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if end_time <= now:
+            end_time += timedelta(days=1)
+        self.preheating_end_time = end_time
+        return end_time
+    
     def is_active(self) -> bool:
         """
         Check if pre-heating mode is currently active.
@@ -84,18 +141,17 @@ class PreheatingController:
         Returns:
             bool: True if preheating_end_time is set and in the future
         """
-        if self.preheating_end_time is None or self.is_enabled is False:
+        # Cheapest checks first: preheating is usually disabled or unset
+        if not self.is_enabled or self._end_timestamp is None:
             return False
         
-        # Check if end time is in the future
-        now = datetime.now()
-        is_active = self.preheating_end_time > now
+        remaining_seconds = self._end_timestamp - time.time()
+        if remaining_seconds <= 0:
+            return False
         
-        if is_active:
-            remaining_seconds = (self.preheating_end_time - now).total_seconds()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug("Pre-heating is ACTIVE: %.0f seconds remaining", remaining_seconds)
-        
-        return is_active
+        return True
     
     def _get_max_high_priority_thermal_load(self) -> float:
         """
@@ -108,18 +164,15 @@ class PreheatingController:
         Returns:
             float: Maximum thermal load (°C·m²), or 0 if no high-priority zones need heat
         """
-        max_load = 0.0
-        
-        for zone in self.master_controller.zones.values():
-            if zone.is_high_priority and zone.current_error > 0:
-                thermal_load = zone.current_error * zone.floor_area_m2
-                max_load = max(max_load, thermal_load)
-                _LOGGER.debug(
-                    "High-priority zone '%s': error=%.1f°C, area=%.1f m², load=%.1f",
-                    zone.name, zone.current_error, zone.floor_area_m2, thermal_load
-                )
-        
-        _LOGGER.debug("Max high-priority thermal load: %.1f °C·m²", max_load)
+        max_load = max(
+            (zone.current_error * zone.floor_area_m2
+             for zone in self.master_controller.zones.values()
+             if zone.is_high_priority and zone.current_error > 0),
+            default=0.0
+        )
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Max high-priority thermal load: %.1f °C·m²", max_load)
         return max_load
     
     def calculate_flow_temp_override(self) -> float:
@@ -139,11 +192,10 @@ class PreheatingController:
         Returns:
             float: Calculated flow temperature override for pre-heating (°C)
         """
-        if not self.is_active():
+        if not self.is_enabled or self._end_timestamp is None:
             return 0.0  # Not preheating
         
-        now = datetime.now()
-        time_remaining_seconds = (self.preheating_end_time - now).total_seconds()
+        time_remaining_seconds = self._end_timestamp - time.time()
         
         # Failsafe: if time is already past, return 0 to fall back to normal logic
         if time_remaining_seconds <= 0:
@@ -164,12 +216,13 @@ class PreheatingController:
         # Calculate final flow temperature
         preheating_flow_temp = MIN_FLOW_TEMP + flow_override
         
-        _LOGGER.debug(
-            "Pre-heating calculation: thermal_load=%.1f, time_remaining=%.0f s, "
-            "time_pressure=%.6f, override=%.1f°C, final_flow_temp=%.1f°C",
-            max_thermal_load, time_remaining_seconds, time_pressure,
-            flow_override, preheating_flow_temp
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Pre-heating calculation: thermal_load=%.1f, time_remaining=%.0f s, "
+                "time_pressure=%.6f, override=%.1f°C, final_flow_temp=%.1f°C",
+                max_thermal_load, time_remaining_seconds, time_pressure,
+                flow_override, preheating_flow_temp
+            )
         
         # Clamp to valid range
-        return max(MIN_FLOW_TEMP, min(MAX_FLOW_TEMP, preheating_flow_temp))
+        return clamp(preheating_flow_temp, MIN_FLOW_TEMP, MAX_FLOW_TEMP)
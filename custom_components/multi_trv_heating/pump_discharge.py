@@ -24,7 +24,18 @@ SOFTWARE.
 
 import logging
 import time
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+try:
+    from homeassistant.core import callback
+    from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+except ImportError:
+    # For testing without Home Assistant installed
+    async_call_later = None
+    async_track_state_change_event = None
+
+    def callback(func):
+        return func
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -54,6 +65,19 @@ class PumpDischargeController:
     - discharge_trv_name: User-friendly name of the discharge TRV device
     """
     
+    __slots__ = (
+        "hass",
+        "discharge_trv_entity_id",
+        "discharge_trv_name",
+        "is_discharging",
+        "discharge_start_time",
+        "boiler_was_on",
+        "_cancel_timeout",
+        "_unsub_switch",
+        "_boost_switch_id",
+        "_switch_payload",
+    )
+    
     def __init__(self, hass: Optional["HomeAssistant"] = None, 
                  discharge_trv_entity_id: Optional[str] = None,
                  discharge_trv_name: Optional[str] = None) -> None:
@@ -71,10 +95,17 @@ class PumpDischargeController:
         
         # State tracking
         self.is_discharging = False  # Is boost switch currently ON?
-        self.discharge_start_time = 0.0  # Timestamp when discharge started
+        self.discharge_start_time = 0.0  # time.monotonic() when discharge started
         self.boiler_was_on = False  # Track previous boiler state for transition detection
+        self._cancel_timeout: Optional[Callable[[], None]] = None  # Scheduled timeout handle
+        self._unsub_switch: Optional[Callable[[], None]] = None  # Boost switch state listener
         
-        _LOGGER.info(
+        # Boost switch entity ID and service payload derived from discharge_trv_entity_id
+        self._boost_switch_id: Optional[str] = None
+        self._switch_payload: Optional[dict] = None
+        self._recompute_switch_id()
+        
+        _LOGGER.debug(
             "PumpDischargeController initialized: discharge_trv=%s (%s)",
             discharge_trv_entity_id or "not set", self.discharge_trv_name
         )
@@ -88,13 +119,98 @@ class PumpDischargeController:
             discharge_trv_entity_id: Climate entity ID of the pump discharge TRV
             discharge_trv_name: User-friendly name of the discharge TRV
         """
+        discharge_trv_name = discharge_trv_name or "Unknown"
+        if (discharge_trv_entity_id == self.discharge_trv_entity_id
+                and discharge_trv_name == self.discharge_trv_name):
+            return  # Unchanged, nothing to recompute
+        
         self.discharge_trv_entity_id = discharge_trv_entity_id
-        self.discharge_trv_name = discharge_trv_name or "Unknown"
+        self.discharge_trv_name = discharge_trv_name
+        self._recompute_switch_id()
         _LOGGER.debug(
             "PumpDischargeController config updated: discharge_trv=%s (%s)",
             discharge_trv_entity_id or "not set", self.discharge_trv_name
         )
     
+    def _recompute_switch_id(self) -> None:
+        """
+        Derive the boost switch entity ID from the discharge TRV entity ID.
+        
+        Converts entity_id format:
+        - climate.hallway_trv → switch.hallway_trv_boost_heating
+        """
+        self._boost_switch_id = None
+        self._switch_payload = None
+        
+        if self.discharge_trv_entity_id:
+            # Extract device name from climate entity ID
+            # e.g., climate.hallway_trv → hallway_trv
+            _, sep, device_name = self.discharge_trv_entity_id.partition(".")
+            if not sep:
+                _LOGGER.error("Invalid entity ID format: %s", self.discharge_trv_entity_id)
+            else:
+                self._boost_switch_id = f"switch.{device_name}{BOOST_HEATING_SWITCH_SUFFIX}"
+                self._switch_payload = {"entity_id": self._boost_switch_id}
+        
+        self._track_switch_state()
+    
+    def _track_switch_state(self) -> None:
+        """
+        (Re)subscribe to state changes of the current boost switch.
+        
+        Lets the controller notice when the switch is turned off outside of
+        its control (e.g. the TRV ends boost on its own or the service failed).
+        """
+        if self._unsub_switch is not None:
+            self._unsub_switch()
+            self._unsub_switch = None
+        
+        if self.hass is None or async_track_state_change_event is None or not self._boost_switch_id:
+            return
+        
+        self._unsub_switch = async_track_state_change_event(
+            self.hass, [self._boost_switch_id], self._handle_switch_changed
+        )
+    
+    @callback
+    def _handle_switch_changed(self, event) -> None:
+        """
+        Event handler: Called when the boost switch's state changes.
+        
+        Only a real ON -> OFF transition is reconciled. Attribute-only updates
+        that still report "off" (e.g. before the non-blocking turn_on has taken
+        effect) are ignored, as is turning the switch on manually, which is a
+        user boost, not a discharge, and must not exclude the zone.
+        
+        Args:
+            event: Home Assistant state change event
+        """
+        if not self.is_discharging:
+            return
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (old_state is None or old_state.state != "on"
+                or new_state is None or new_state.state != "off"):
+            return
+        
+        self._cancel_discharge_timeout()
+        self.is_discharging = False
+        _LOGGER.info(
+            "PumpDischarge: Switch %s reported off, discharge stopped", self._boost_switch_id
+        )
+    
+    @callback
+    def async_teardown(self) -> None:
+        """
+        Release the boost switch listener and any pending discharge timeout.
+        
+        Called when the config entry is unloaded.
+        """
+        if self._unsub_switch is not None:
+            self._unsub_switch()
+            self._unsub_switch = None
+        self._cancel_discharge_timeout()
+    
     def is_discharge_valve(self, entity_id: str) -> bool:
         """
         Check if a given entity ID is the configured discharge valve.
@@ -105,7 +221,9 @@ class PumpDischargeController:
         Returns:
             bool: True if this is the discharge TRV
         """
-        return self.is_discharge_active() and entity_id == self.discharge_trv_entity_id and self.discharge_trv_entity_id is not None
+        # Cheapest, most discriminating check first: usually no discharge TRV is set
+        tid = self.discharge_trv_entity_id
+        return tid is not None and entity_id == tid and self.is_discharging
     
     def is_discharge_active(self) -> bool:
         """
@@ -126,6 +244,7 @@ class PumpDischargeController:
         1. If boiler should be ON → disable discharge (zones need heat)
         2. If boiler transitions from ON to OFF → enable discharge (keep pump circulating)
         3. If discharge running and timeout elapsed → disable discharge
+           (normally done by the scheduled _on_timeout; checked here as a fallback)
         4. If boiler reactivates while discharging → disable discharge
 
         Args:
@@ -137,6 +256,7 @@ class PumpDischargeController:
         
         # Case 1: Boiler should be ON → disable discharge (zones need heat)
         if boiler_should_be_on:
+            self._cancel_discharge_timeout()
             if self.is_discharging:
                 await self._disable_discharge()
                 _LOGGER.info(
@@ -158,8 +278,8 @@ class PumpDischargeController:
                 self.discharge_trv_name, PUMP_DISCHARGE_TIMEOUT
             )
         elif self.is_discharging:
-            # Already discharging, check timeout
-            elapsed = time.time() - self.discharge_start_time
+            # Fallback in case the scheduled timeout could not be set up or was missed
+            elapsed = time.monotonic() - self.discharge_start_time
             if elapsed > PUMP_DISCHARGE_TIMEOUT:
                 await self._disable_discharge()
                 _LOGGER.info(
@@ -167,77 +287,105 @@ class PumpDischargeController:
                     elapsed, PUMP_DISCHARGE_TIMEOUT
                 )
     
+    def _cancel_discharge_timeout(self) -> None:
+        """Cancel the pending discharge timeout callback, if any."""
+        if self._cancel_timeout is not None:
+            self._cancel_timeout()
+            self._cancel_timeout = None
+    
+    @callback
+    def _on_timeout(self, _now) -> None:
+        """
+        Disable discharge once PUMP_DISCHARGE_TIMEOUT has elapsed.
+        
+        Scheduled by async_call_later in _enable_discharge, so the timeout
+        fires at the deadline instead of waiting for the next controller tick.
+        """
+        self._cancel_timeout = None
+        if not self.is_discharging:
+            return
+        _LOGGER.info(
+            "PumpDischarge: Timeout elapsed (%.0fs), disabling discharge",
+            PUMP_DISCHARGE_TIMEOUT
+        )
+        self.hass.async_create_task(self._disable_discharge())
+    
     async def _enable_discharge(self) -> None:
         """
         Enable the discharge TRV by turning on its boost_heating switch.
         
-        Converts entity_id format:
-        - climate.hallway_trv → switch.hallway_trv_boost_heating
+        No-op if discharge is already running.
         """
+        if self.is_discharging:
+            return
         if not self.hass or not self.discharge_trv_entity_id:
             _LOGGER.warning("PumpDischarge: Cannot enable - hass or entity_id not set")
             return
+        if not self._boost_switch_id:
+            return
+        
+        # Flip state before awaiting so a concurrent caller hits the guard above
+        self.is_discharging = True
+        self.discharge_start_time = time.monotonic()
+        
+        # Schedule the timeout instead of polling for it on every tick
+        self._cancel_discharge_timeout()
+        if async_call_later is not None:
+            self._cancel_timeout = async_call_later(
+                self.hass, PUMP_DISCHARGE_TIMEOUT, self._on_timeout
+            )
         
         try:
-            # Extract device name from climate entity ID
-            # e.g., climate.hallway_trv → hallway_trv
-            climate_id_parts = self.discharge_trv_entity_id.split(".")
-            if len(climate_id_parts) < 2:
-                _LOGGER.error("Invalid entity ID format: %s", self.discharge_trv_entity_id)
-                return
-            
-            device_name = climate_id_parts[1]
-            boost_switch_id = f"switch.{device_name}{BOOST_HEATING_SWITCH_SUFFIX}"
-            
-            _LOGGER.debug("PumpDischarge: Enabling switch %s", boost_switch_id)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("PumpDischarge: Enabling switch %s", self._boost_switch_id)
             
             # Call Home Assistant switch service to turn ON
             await self.hass.services.async_call(
                 "switch",
                 "turn_on",
-                {"entity_id": boost_switch_id},
+                self._switch_payload,
                 blocking=False,
             )
             
-            self.is_discharging = True
-            self.discharge_start_time = time.time()
-            
-            _LOGGER.info("PumpDischarge: Switch %s enabled (discharge started)", boost_switch_id)
+            _LOGGER.debug("PumpDischarge: Switch %s enabled (discharge started)", self._boost_switch_id)
             
         except Exception as e:
+            # Switch was not turned on: roll back the optimistic state
+            self._cancel_discharge_timeout()
+            self.is_discharging = False
             _LOGGER.error("PumpDischarge: Error enabling discharge: %s", e)
     
     async def _disable_discharge(self) -> None:
         """
         Disable the discharge TRV by turning off its boost_heating switch.
+        
+        No-op if discharge is not running.
         """
+        if not self.is_discharging:
+            return
         if not self.hass or not self.discharge_trv_entity_id:
             _LOGGER.warning("PumpDischarge: Cannot disable - hass or entity_id not set")
             return
         
+        # Flip state before awaiting so a concurrent caller hits the guard above
+        self._cancel_discharge_timeout()
+        self.is_discharging = False
+        if not self._boost_switch_id:
+            return
+        
         try:
-            # Extract device name from climate entity ID
-            climate_id_parts = self.discharge_trv_entity_id.split(".")
-            if len(climate_id_parts) < 2:
-                _LOGGER.error("Invalid entity ID format: %s", self.discharge_trv_entity_id)
-                return
-            
-            device_name = climate_id_parts[1]
-            boost_switch_id = f"switch.{device_name}{BOOST_HEATING_SWITCH_SUFFIX}"
-            
-            _LOGGER.debug("PumpDischarge: Disabling switch %s", boost_switch_id)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("PumpDischarge: Disabling switch %s", self._boost_switch_id)
             
             # Call Home Assistant switch service to turn OFF
             await self.hass.services.async_call(
                 "switch",
                 "turn_off",
-                {"entity_id": boost_switch_id},
+                self._switch_payload,
                 blocking=False,
             )
             
-            self.is_discharging = False
-            
-            _LOGGER.info("PumpDischarge: Switch %s disabled (discharge stopped)", boost_switch_id)
+            _LOGGER.debug("PumpDischarge: Switch %s disabled (discharge stopped)", self._boost_switch_id)
             
         except Exception as e:
             _LOGGER.error("PumpDischarge: Error disabling discharge: %s", e)
@@ -251,7 +399,7 @@ class PumpDischargeController:
         """
         elapsed = 0.0
         if self.is_discharging:
-            elapsed = time.time() - self.discharge_start_time
+            elapsed = time.monotonic() - self.discharge_start_time
         
         return {
             "discharge_trv_entity_id": self.discharge_trv_entity_id,
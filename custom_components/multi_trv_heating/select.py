@@ -33,6 +33,9 @@ class MultiTRVHeatingSelect(SelectEntity if SelectEntity != object else object):
     Represents a configurable choice (e.g., which TRV to use as discharge valve).
     """
     
+    # Options only change on user selection; state is pushed via async_write_ha_state
+    _attr_should_poll = False
+    
     def __init__(self, name: str, unique_id: str, icon: Optional[str] = None,
                  device_info: Optional[Any] = None) -> None:
         """
@@ -110,10 +113,9 @@ class DischargeTRVSelect(MultiTRVHeatingSelect):
                     self.controller.pump_discharge.update_config(None, None)
                 else:
                     # Find zone with this name and update config
-                    for zone in self.controller.zones.values():
-                        if zone.name == stored_option:
-                            self.controller.pump_discharge.update_config(zone.entity_id, zone.name)
-                            break
+                    zone = self._name_to_zone.get(stored_option)
+                    if zone is not None:
+                        self.controller.pump_discharge.update_config(zone.entity_id, zone.name)
                 _LOGGER.info("Restored discharge TRV selection from storage: %s", stored_option)
             else:
                 # Set current option based on controller's pump discharge config
@@ -130,29 +132,36 @@ class DischargeTRVSelect(MultiTRVHeatingSelect):
         """
         options = ["Off"]  # Always include "Off" to disable discharge
         
+        # Zone lookup by option name, used when an option is selected
+        self._name_to_zone = {}
         if self.controller and self.controller.zones:
-            for zone in self.controller.zones.values():
-                options.append(zone.name)
+            self._name_to_zone = {zone.name: zone for zone in self.controller.zones.values()}
+            options.extend(self._name_to_zone)
         
         self._attr_options = options
-        _LOGGER.debug("Discharge TRV options updated: %s", options)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Discharge TRV options updated: %s", options)
     
     def _update_current_option(self) -> None:
-        """Update the current selected option based on controller state."""
-        if not self.controller or not self.controller.pump_discharge:
-            self._attr_current_option = "Off"
-            return
+        """
+        Update the current selected option based on controller state.
         
-        discharge_trv_name = self.controller.pump_discharge.discharge_trv_name
+        State is only written to HA when the option actually changes and the
+        entity has already been added.
+        """
+        new_option = "Off"
+        if self.controller and self.controller.pump_discharge:
+            discharge_trv_name = self.controller.pump_discharge.discharge_trv_name
+            # Configured TRV not in options (or not set) falls back to Off
+            if discharge_trv_name and discharge_trv_name != "Unknown" and discharge_trv_name in self._attr_options:
+                new_option = discharge_trv_name
         
-        if discharge_trv_name and discharge_trv_name != "Unknown":
-            if discharge_trv_name in self._attr_options:
-                self._attr_current_option = discharge_trv_name
-            else:
-                # Configured TRV not in options, set to Off
-                self._attr_current_option = "Off"
-        else:
-            self._attr_current_option = "Off"
+        if new_option == self._attr_current_option:
+            return
+        
+        self._attr_current_option = new_option
+        if self.hass and getattr(self, "entity_id", None):
+            self.async_write_ha_state()
     
     async def async_select_option(self, option: str) -> None:
         """
@@ -163,6 +172,10 @@ class DischargeTRVSelect(MultiTRVHeatingSelect):
         Args:
             option: The selected zone name or "Off"
         """
+        # Re-selecting the current option changes nothing; skip the state write
+        if option == self._attr_current_option:
+            return
+        
         if not self.controller or not self.controller.pump_discharge:
             _LOGGER.warning("DischargeTRVSelect: Cannot select - controller not available")
             return
@@ -174,16 +187,12 @@ class DischargeTRVSelect(MultiTRVHeatingSelect):
             _LOGGER.info("Discharge TRV disabled (selection: Off)")
         else:
             # Find the zone with matching name and update config
-            found = False
-            for zone in self.controller.zones.values():
-                if zone.name == option:
-                    self.controller.pump_discharge.update_config(zone.entity_id, zone.name)
-                    self._attr_current_option = option
-                    _LOGGER.info("Discharge TRV updated to: %s (entity_id: %s)", option, zone.entity_id)
-                    found = True
-                    break
-            
-            if not found:
+            zone = self._name_to_zone.get(option)
+            if zone is not None:
+                self.controller.pump_discharge.update_config(zone.entity_id, zone.name)
+                self._attr_current_option = option
+                _LOGGER.info("Discharge TRV updated to: %s (entity_id: %s)", option, zone.entity_id)
+            else:
                 _LOGGER.warning("DischargeTRVSelect: Could not find zone with name '%s'", option)
                 self._attr_current_option = "Off"
         
@@ -192,7 +201,7 @@ class DischargeTRVSelect(MultiTRVHeatingSelect):
         # Persist state to storage
         storage = get_storage()
         if storage:
-            await storage.async_set_and_save(f"discharge_trv_select_{self._attr_unique_id}", self._attr_current_option)
+            storage.async_set_and_delay_save(f"discharge_trv_select_{self._attr_unique_id}", self._attr_current_option)
 
 
 class MultiTRVHeatingSelectManager:
@@ -282,5 +291,5 @@ async def async_setup_entry(
     manager = MultiTRVHeatingSelectManager(controller, entry.entry_id, controller_device_info, hass)
     entities = manager.get_all_entities()
     
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
     _LOGGER.info("Set up %d MultiTRVHeating select entities for entry %s", len(entities), entry.entry_id)
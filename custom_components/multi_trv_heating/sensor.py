@@ -33,8 +33,14 @@ except ImportError:
     ConfigType = None
     ConfigEntry = None
 
+    def callback(func):
+        return func
+
 _LOGGER = logging.getLogger("don_controller")
 
+# Marker for "no value written yet" (None is a valid sensor value)
+_UNSET = object()
+
 
 class MultiTRVHeatingSensor(SensorEntity if SensorEntity != object else object):
     """
@@ -42,8 +48,13 @@ class MultiTRVHeatingSensor(SensorEntity if SensorEntity != object else object):
     
     Represents a single monitored value (temperature, demand, opening %, etc.)
     for either the controller as a whole or a specific zone.
+    
+    Values are pushed: the controller notifies sensors after state changes
+    instead of HA polling them.
     """
     
+    _attr_should_poll = False
+    
     def __init__(self, name: str, unique_id: str, unit_of_measurement: Optional[str] = None,
                  state_class: Optional[str] = None, icon: Optional[str] = None,
                  device_info: Optional[Any] = None) -> None:
@@ -65,11 +76,39 @@ class MultiTRVHeatingSensor(SensorEntity if SensorEntity != object else object):
         self._attr_icon = icon
         self._attr_native_value = None
         self._attr_device_info = device_info
+        self._last_value = _UNSET  # Last value written to HA (see _handle_update)
     
     @property
     def state(self) -> Any:
         """Return the current state of the sensor."""
         return self._attr_native_value
+    
+    def _get_update_source(self):
+        """Return the MasterController whose updates drive this sensor (if any)."""
+        return None
+    
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to controller updates once the entity is registered."""
+        await super().async_added_to_hass()
+        # HA writes the initial state right after this; remember what it will write
+        self._last_value = self.state
+        controller = self._get_update_source()
+        if controller is not None:
+            self.async_on_remove(controller.async_add_listener(self._handle_update))
+    
+    @callback
+    def _handle_update(self) -> None:
+        """
+        Write state to HA only if the sensor value changed since the last write.
+        
+        Registered as a controller listener, so it runs after every zone or
+        controller update; most metrics change far less often than that.
+        """
+        value = self.state
+        if value == self._last_value:
+            return
+        self._last_value = value
+        self.async_write_ha_state()
 
 
 class ControllerSensor(MultiTRVHeatingSensor):
@@ -104,16 +143,17 @@ class ControllerSensor(MultiTRVHeatingSensor):
         self.metric_key = metric_key
         self.controller = None  # Will be set when attached to controller
     
+    def _get_update_source(self):
+        """Controller sensors are updated by their controller."""
+        return self.controller
+    
     @property
     def state(self) -> Any:
         """Return current controller metric value."""
         if self.controller is None:
             return None
         
-        state = self.controller.get_controller_state()
-        if state and self.metric_key in state:
-            return state[self.metric_key]
-        return None
+        return self.controller.get_controller_value(self.metric_key)
 
 
 class ZoneSensor(MultiTRVHeatingSensor):
@@ -124,7 +164,7 @@ class ZoneSensor(MultiTRVHeatingSensor):
     def __init__(self, zone_name: str, metric_name: str, metric_key: str,
                  unit: Optional[str] = None, state_class: Optional[str] = None,
                  icon: Optional[str] = None, entry_id: Optional[str] = None,
-                 device_info: Optional[Any] = None) -> None:
+                 device_info: Optional[Any] = None, zone_slug: Optional[str] = None) -> None:
         """
         Initialize a zone sensor.
         
@@ -137,10 +177,12 @@ class ZoneSensor(MultiTRVHeatingSensor):
             icon: Icon name
             entry_id: Config entry ID for prefixing unique IDs
             device_info: Device info dict for grouping entities
+            zone_slug: Precomputed zone slug (derived from zone_name if omitted)
         """
         name = f"{zone_name} {metric_name}"
-        zone_name_lower = zone_name.lower().replace(" ", "_")
-        unique_id = f"multi_trv_{zone_name_lower}_{metric_key}"
+        if zone_slug is None:
+            zone_slug = zone_name.lower().replace(" ", "_")
+        unique_id = f"multi_trv_{zone_slug}_{metric_key}"
         
         # Prefix unique_id with entry_id for better organization
         if entry_id:
@@ -153,16 +195,17 @@ class ZoneSensor(MultiTRVHeatingSensor):
         self.metric_key = metric_key
         self.zone = None  # Will be set when attached to zone
     
+    def _get_update_source(self):
+        """Zone sensors are updated by the controller owning their zone."""
+        return self.zone.master_controller if self.zone is not None else None
+    
     @property
     def state(self) -> Any:
         """Return current zone metric value."""
         if self.zone is None:
             return None
         
-        state = self.zone.export_zone_state()
-        if state and self.metric_key in state:
-            return state[self.metric_key]
-        return None
+        return self.zone.get_state_value(self.metric_key)
 
 
 class MultiTRVHeatingEntityManager:
@@ -175,13 +218,13 @@ class MultiTRVHeatingEntityManager:
     """
     
     # Controller sensors: (name, unique_id, metric_key, unit, state_class, icon)
-    CONTROLLER_SENSORS = [
+    CONTROLLER_SENSORS = (
         ("Zone Count", "zone_count", "zone_count", None, None, "mdi:counter"),
         ("OpenTherm Flow Temperature", "opentherm_flow_temp", "current_flow_temp", _UNIT_TEMP, "measurement", "mdi:thermometer-high"),
-    ]
+    )
     
     # Zone sensors: (metric_name, metric_key, unit, state_class, icon)
-    ZONE_SENSORS = [
+    ZONE_SENSORS = (
         ("Current Temperature", "current_temperature", _UNIT_TEMP, "measurement", "mdi:thermometer"),
         ("Target Temperature", "target_temperature", _UNIT_TEMP, "measurement", "mdi:target-temperature"),
         ("Temperature Error", "temperature_error", _UNIT_TEMP, "measurement", "mdi:delta"),
@@ -191,7 +234,10 @@ class MultiTRVHeatingEntityManager:
         ("Floor Area", "floor_area_m2", "m²", None, "mdi:ruler"),
         ("Has External Sensor", "has_external_sensor", None, None, "mdi:thermometer-plus"),
         ("External Sensor Temperature", "external_sensor_temperature", _UNIT_TEMP, "measurement", "mdi:thermometer"),
-    ]
+    )
+    
+    # Zone metrics that only carry a value when the zone has an external sensor
+    EXTERNAL_SENSOR_METRICS = frozenset({"external_sensor_temperature"})
     
     def __init__(self, controller, entry_id: Optional[str] = None,
                  zone_devices: Optional[dict] = None, controller_device: Optional[Any] = None) -> None:
@@ -209,7 +255,7 @@ class MultiTRVHeatingEntityManager:
         self.zone_devices = zone_devices or {}
         self.controller_device = controller_device
         self.controller_sensors = []
-        self.zone_sensors = {}  # { zone_entity_id: [sensor1, sensor2, ...] }
+        self.zone_sensors = {}  # { zone_entity_id: (sensor1, sensor2, ...) }
         self._create_sensors()
     
     def _create_sensors(self) -> None:
@@ -220,7 +266,8 @@ class MultiTRVHeatingEntityManager:
                                     self.controller_device)
             sensor.controller = self.controller
             self.controller_sensors.append(sensor)
-            _LOGGER.debug("Created controller sensor: %s", name)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Created %d controller sensors", len(self.controller_sensors))
         
         # Create zone sensors
         for zone_entity_id, zone in self.controller.zones.items():
@@ -229,31 +276,37 @@ class MultiTRVHeatingEntityManager:
             device_info = self.zone_devices.get(zone_entity_id)
             
             for metric_name, metric_key, unit, state_class, icon in self.ZONE_SENSORS:
+                # Without an external sensor this reading is always None
+                if metric_key in self.EXTERNAL_SENSOR_METRICS and zone.ext_temp_entity_id is None:
+                    continue
                 sensor = ZoneSensor(zone.name, metric_name, metric_key, unit, state_class, icon, 
-                                  self.entry_id, device_info)
+                                  self.entry_id, device_info, zone.slug)
                 sensor.zone = zone
                 zone_sensors.append(sensor)
-                _LOGGER.debug("Created zone sensor: %s - %s", zone.name, metric_name)
             
-            self.zone_sensors[zone_entity_id] = zone_sensors
+            self.zone_sensors[zone_entity_id] = tuple(zone_sensors)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Created %d zone sensors for %s", len(zone_sensors), zone.name)
+        
+        # Sensors never change after creation, so build the flat list once
+        self._all_sensors = tuple(self.controller_sensors) + tuple(
+            sensor for sensors in self.zone_sensors.values() for sensor in sensors
+        )
     
-    def get_all_sensors(self) -> list:
+    def get_all_sensors(self) -> tuple:
         """
         Get all sensor entities (for HA integration).
         
         Returns:
-            List of all MultiTRVHeatingSensor entities
+            Tuple of all MultiTRVHeatingSensor entities
         """
-        all_sensors = self.controller_sensors.copy()
-        for sensors in self.zone_sensors.values():
-            all_sensors.extend(sensors)
-        return all_sensors
+        return self._all_sensors
     
     def get_controller_sensors(self) -> list:
         """Get controller-level sensors."""
         return self.controller_sensors
     
-    def get_zone_sensors(self, zone_entity_id: str) -> list:
+    def get_zone_sensors(self, zone_entity_id: str) -> tuple:
         """
         Get sensors for a specific zone.
         
@@ -261,9 +314,9 @@ class MultiTRVHeatingEntityManager:
             zone_entity_id: Climate entity ID of the zone
             
         Returns:
-            List of sensors for the zone, or empty list if zone not found
+            Tuple of sensors for the zone, or empty tuple if zone not found
         """
-        return self.zone_sensors.get(zone_entity_id, [])
+        return self.zone_sensors.get(zone_entity_id, ())
 
 
 async def async_setup_entry(
@@ -305,19 +358,18 @@ async def async_setup_entry(
     # Entities with matching identifiers will group under the same device
     zone_device_infos = {}
     if DeviceInfo is not None:  # Only if running with Home Assistant
-        for zone_entity_id, zone in controller.zones.items():
-            zone_name_slug = zone.name.lower().replace(" ", "_").replace("-", "_")
-            device_id = f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}"
-            
-            zone_device_infos[zone_entity_id] = DeviceInfo(
-                identifiers={("multi_trv_heating", device_id)},
+        zone_device_infos = {
+            zone_entity_id: DeviceInfo(
+                identifiers={("multi_trv_heating", f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}")},
                 name=zone.name,
                 manufacturer="Multi-TRV Heating",
                 model="Zone Controller",
             )
+            for zone_entity_id, zone in controller.zones.items()
+        }
     
     manager = MultiTRVHeatingEntityManager(controller, entry.entry_id, zone_device_infos, controller_device_info)
     sensors = manager.get_all_sensors()
     
-    async_add_entities(sensors, update_before_add=True)
+    async_add_entities(sensors)
     _LOGGER.info("Set up %d MultiTRVHeating sensors for entry %s", len(sensors), entry.entry_id)
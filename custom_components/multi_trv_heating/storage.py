@@ -21,6 +21,9 @@ _LOGGER = logging.getLogger("don_controller")
 DOMAIN = "multi_trv_heating"
 STORAGE_VERSION = 1
 
+# Idle delay (seconds) before coalesced writes are flushed to disk
+SAVE_DELAY = 2
+
 
 class StateStorage:
     """Manages persistent state storage for MultiTRVHeating entities."""
@@ -85,6 +88,23 @@ class StateStorage:
         """Set value and immediately save to disk."""
         self.set(key, value)
         await self.async_save()
+    
+    def async_set_and_delay_save(self, key: str, value: Any) -> None:
+        """
+        Set value and schedule a coalesced save to disk.
+        
+        Rapid successive calls (e.g. slider adjustments) are merged into a
+        single write once no new value has arrived for SAVE_DELAY seconds.
+        Pending data is also flushed by Home Assistant on shutdown.
+        """
+        self.set(key, value)
+        if not self.store:
+            return
+        self.store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to be written by a delayed save."""
+        return self.data
 
 
 # Global storage instance
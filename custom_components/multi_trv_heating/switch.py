@@ -5,24 +5,22 @@ Provides switch entities for controlling zone-specific settings like priority le
 """
 
 import logging
-from typing import Optional, Any
+from typing import TYPE_CHECKING, Optional, Any
 
 try:
     from homeassistant.components.switch import SwitchEntity
-    from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant, callback
-    from homeassistant.helpers.entity_platform import AddEntitiesCallback
-    from homeassistant.helpers.typing import ConfigType
     from homeassistant.helpers.device_registry import DeviceInfo
 except ImportError:
     # For testing without Home Assistant
     SwitchEntity = object
-    HomeAssistant = None
-    AddEntitiesCallback = None
-    ConfigType = None
-    ConfigEntry = None
     DeviceInfo = None
 
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import DOMAIN
 from .storage import get_storage
 
 _LOGGER = logging.getLogger("don_controller")
@@ -31,22 +29,23 @@ _LOGGER = logging.getLogger("don_controller")
 class MultiTRVHeatingSwitch(SwitchEntity if SwitchEntity != object else object):
     """Base switch class for MultiTRVHeating control entities."""
     
-    def __init__(self, name: str, unique_id: str, icon: Optional[str] = None,
+    def __init__(self, name: Optional[str], unique_id: str,
                  device_info: Optional[Any] = None) -> None:
         """
         Initialize a MultiTRVHeating switch.
         
+        Icon, and the name where it is fixed, are class attributes on each subclass.
+        
         Args:
-            name: Human-readable switch name
+            name: Human-readable switch name (None keeps the class-level name)
             unique_id: Unique identifier for HA entity registry
-            icon: Icon name (e.g., "mdi:toggle-switch")
             device_info: Device info dict for grouping entities
         """
-        self._attr_name = name
+        if name is not None:
+            self._attr_name = name
         self._attr_unique_id = unique_id
-        self._attr_icon = icon
         self._attr_device_info = device_info
-        self._is_on = False
+        self._attr_is_on = False
 
 
 class ZonePrioritySwitch(MultiTRVHeatingSwitch):
@@ -57,6 +56,8 @@ class ZonePrioritySwitch(MultiTRVHeatingSwitch):
     OFF = Low priority (requires 100% opening to trigger)
     """
     
+    _attr_icon = "mdi:priority-high"
+    
     def __init__(self, zone_name: str, zone_entity_id: str, zone,
                  entry_id: Optional[str] = None, device_info: Optional[Any] = None,
                  hass: Optional[Any] = None) -> None:
@@ -72,15 +73,15 @@ class ZonePrioritySwitch(MultiTRVHeatingSwitch):
             hass: Home Assistant instance for state restoration
         """
         name = f"{zone_name} Priority (High)"
-        zone_name_lower = zone_name.lower().replace(" ", "_")
-        unique_id = f"multi_trv_{zone_name_lower}_priority_switch"
+        zone_slug = zone.slug if zone else zone_name.lower().replace(" ", "_")
+        unique_id = f"multi_trv_{zone_slug}_priority_switch"
         
         if entry_id:
             prefixed_id = f"{entry_id}_{unique_id}"
         else:
             prefixed_id = unique_id
         
-        super().__init__(name, prefixed_id, "mdi:priority-high", device_info)
+        super().__init__(name, prefixed_id, device_info)
         self.zone = zone
         self.zone_entity_id = zone_entity_id
         self.hass = hass
@@ -99,33 +100,32 @@ class ZonePrioritySwitch(MultiTRVHeatingSwitch):
         else:
             self._attr_is_on = zone.is_high_priority if zone else True
     
-    @property
-    def is_on(self) -> bool:
-        """Return True if zone is high priority."""
-        return self.zone.is_high_priority if self.zone else False
-    
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on - set zone to high priority."""
         if self.zone:
+            if self.zone.is_high_priority:
+                return  # Already high priority, nothing to write or persist
             self.zone.is_high_priority = True
             self._attr_is_on = True
             self.async_write_ha_state()
             # Persist state to storage
             storage = get_storage()
             if storage:
-                await storage.async_set_and_save(f"zone_priority_{self._attr_unique_id}", True)
+                storage.async_set_and_delay_save(f"zone_priority_{self._attr_unique_id}", True)
             _LOGGER.info("Set zone %s to high priority", self.zone.name)
     
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off - set zone to low priority."""
         if self.zone:
+            if not self.zone.is_high_priority:
+                return  # Already low priority, nothing to write or persist
             self.zone.is_high_priority = False
             self._attr_is_on = False
             self.async_write_ha_state()
             # Persist state to storage
             storage = get_storage()
             if storage:
-                await storage.async_set_and_save(f"zone_priority_{self._attr_unique_id}", False)
+                storage.async_set_and_delay_save(f"zone_priority_{self._attr_unique_id}", False)
             _LOGGER.info("Set zone %s to low priority", self.zone.name)
 
 
@@ -137,6 +137,10 @@ class PreheatingEnableSwitch(MultiTRVHeatingSwitch):
     When disabled or after timeout, preheating stops.
     """
     
+    _attr_name = "Preheating"
+    _attr_icon = "mdi:fire"
+    _attr_has_entity_name = True
+    
     def __init__(self, controller, entry_id: Optional[str] = None,
                  controller_device: Optional[Any] = None,
                  hass: Optional[Any] = None) -> None:
@@ -156,22 +160,20 @@ class PreheatingEnableSwitch(MultiTRVHeatingSwitch):
             unique_id = "multi_trv_preheating_enable"
         
         super().__init__(
-            name="Preheating",
+            name=None,
             unique_id=unique_id,
-            icon="mdi:fire",
             device_info=controller_device
         )
         
         self.controller = controller
         self.hass = hass
-        self._attr_has_entity_name = True
         
         # Restore state from storage if available
         storage = get_storage()
         if storage:
             stored_value = storage.get(f"preheating_enabled_{unique_id}")
             if stored_value is not None:
-                self._is_on = stored_value
+                self._attr_is_on = stored_value
                 if self.controller and self.controller.preheating:
                     self.controller.preheating.is_enabled = stored_value
                 _LOGGER.info("Restored preheating state from storage: %s", stored_value)
@@ -184,37 +186,36 @@ class PreheatingEnableSwitch(MultiTRVHeatingSwitch):
     def _update_state(self) -> None:
         """Update the switch state based on preheating controller."""
         if self.controller and self.controller.preheating:
-            self._is_on = self.controller.preheating.is_enabled
+            self._attr_is_on = self.controller.preheating.is_enabled
         else:
-            self._is_on = False
-    
-    @property
-    def is_on(self) -> bool:
-        """Return True if switch is on."""
-        return self._is_on
+            self._attr_is_on = False
     
     async def async_turn_on(self, **kwargs) -> None:
         """Enable preheating."""
         if self.controller and self.controller.preheating:
+            if self.controller.preheating.is_enabled:
+                return  # Already enabled, nothing to write or persist
             self.controller.preheating.is_enabled = True
-            self._is_on = True
+            self._attr_is_on = True
             self.async_write_ha_state()
             # Persist state to storage
             storage = get_storage()
             if storage:
-                await storage.async_set_and_save(f"preheating_enabled_{self._attr_unique_id}", True)
+                storage.async_set_and_delay_save(f"preheating_enabled_{self._attr_unique_id}", True)
             _LOGGER.info("Preheating enabled via switch")
     
     async def async_turn_off(self, **kwargs) -> None:
         """Disable preheating."""
         if self.controller and self.controller.preheating:
+            if not self.controller.preheating.is_enabled:
+                return  # Already disabled, nothing to write or persist
             self.controller.preheating.is_enabled = False
-            self._is_on = False
+            self._attr_is_on = False
             self.async_write_ha_state()
             # Persist state to storage
             storage = get_storage()
             if storage:
-                await storage.async_set_and_save(f"preheating_enabled_{self._attr_unique_id}", False)
+                storage.async_set_and_delay_save(f"preheating_enabled_{self._attr_unique_id}", False)
             _LOGGER.info("Preheating disabled via switch")
 
 
@@ -226,6 +227,10 @@ class ComponentEnableSwitch(MultiTRVHeatingSwitch):
     the boiler. When enabled, normal operation resumes.
     """
     
+    _attr_name = "Component Enable"
+    _attr_icon = "mdi:power"
+    _attr_has_entity_name = True
+    
     def __init__(self, controller, entry_id: Optional[str] = None,
                  controller_device: Optional[Any] = None,
                  hass: Optional[Any] = None) -> None:
@@ -245,58 +250,55 @@ class ComponentEnableSwitch(MultiTRVHeatingSwitch):
             unique_id = "multi_trv_component_enable"
         
         super().__init__(
-            name="Component Enable",
+            name=None,
             unique_id=unique_id,
-            icon="mdi:power",
             device_info=controller_device
         )
         
         self.controller = controller
         self.hass = hass
-        self._attr_has_entity_name = True
         
         # Restore state from storage if available, otherwise default to enabled
         storage = get_storage()
         if storage:
             stored_value = storage.get(f"component_enabled_{unique_id}")
             if stored_value is not None:
-                self._is_on = stored_value
+                self._attr_is_on = stored_value
                 self.controller.component_enabled = stored_value
                 _LOGGER.info("Restored component enabled state from storage: %s", stored_value)
             else:
                 # Default: component is enabled
-                self._is_on = True
+                self._attr_is_on = True
                 self.controller.component_enabled = True
         else:
             # Default: component is enabled
-            self._is_on = True
+            self._attr_is_on = True
             self.controller.component_enabled = True
     
-    @property
-    def is_on(self) -> bool:
-        """Return True if switch is on."""
-        return self._is_on
-    
     async def async_turn_on(self, **kwargs) -> None:
         """Enable the component."""
+        if self.controller.component_enabled:
+            return  # Already enabled, nothing to write or persist
         self.controller.component_enabled = True
-        self._is_on = True
+        self._attr_is_on = True
         self.async_write_ha_state()
         # Persist state to storage
         storage = get_storage()
         if storage:
-            await storage.async_set_and_save(f"component_enabled_{self._attr_unique_id}", True)
+            storage.async_set_and_delay_save(f"component_enabled_{self._attr_unique_id}", True)
         _LOGGER.info("MultiTRVHeating component enabled")
     
     async def async_turn_off(self, **kwargs) -> None:
         """Disable the component."""
+        if not self.controller.component_enabled:
+            return  # Already disabled, nothing to write or persist
         self.controller.component_enabled = False
-        self._is_on = False
+        self._attr_is_on = False
         self.async_write_ha_state()
         # Persist state to storage
         storage = get_storage()
         if storage:
-            await storage.async_set_and_save(f"component_enabled_{self._attr_unique_id}", False)
+            storage.async_set_and_delay_save(f"component_enabled_{self._attr_unique_id}", False)
         _LOGGER.info("MultiTRVHeating component disabled")
 
 
@@ -318,40 +320,39 @@ async def async_setup_entry(
         entry: Config entry for this integration
         async_add_entities: Callback to add entities
     """
-    from . import DOMAIN
-    
     # Get the controller instance
-    if entry.entry_id not in hass.data.get(DOMAIN, {}):
+    domain_data = hass.data.get(DOMAIN)
+    if not domain_data or entry.entry_id not in domain_data:
         _LOGGER.error("No controller found for entry %s", entry.entry_id)
         return
     
-    controller = hass.data[DOMAIN][entry.entry_id]
-    
-    switches = []
+    controller = domain_data[entry.entry_id]
     
-    # Create priority switch for each zone
-    for zone_entity_id, zone in controller.zones.items():
-        # Create device info for this zone
-        device_id = f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}"
-        device_info = None
-        if DeviceInfo is not None:
-            device_info = DeviceInfo(
-                identifiers={("multi_trv_heating", device_id)},
+    # Create device info for each zone up front (same identifiers as sensor.py)
+    zone_device_infos = {}
+    if DeviceInfo is not None:  # Only if running with Home Assistant
+        zone_device_infos = {
+            zone_entity_id: DeviceInfo(
+                identifiers={(DOMAIN, f"{entry.entry_id}_{zone_entity_id.replace('.', '_')}")},
                 name=zone.name,
                 manufacturer="Multi-TRV Heating",
                 model="Zone Controller",
             )
-        
-        switch = ZonePrioritySwitch(
+            for zone_entity_id, zone in controller.zones.items()
+        }
+    
+    # Create priority switch for each zone
+    switches = [
+        ZonePrioritySwitch(
             zone.name,
             zone_entity_id,
             zone,
             entry.entry_id,
-            device_info,
+            zone_device_infos.get(zone_entity_id),
             hass
         )
-        switches.append(switch)
-        _LOGGER.debug("Created priority switch for zone: %s", zone.name)
+        for zone_entity_id, zone in controller.zones.items()
+    ]
     
     # Create controller-level device info
     controller_device = None
@@ -371,7 +372,6 @@ async def async_setup_entry(
         hass=hass
     )
     switches.append(preheating_switch)
-    _LOGGER.debug("Created preheating enable switch")
     
     # Create component enable switch
     component_switch = ComponentEnableSwitch(
@@ -381,8 +381,13 @@ async def async_setup_entry(
         hass=hass
     )
     switches.append(component_switch)
-    _LOGGER.debug("Created component enable switch")
     
-    if switches:
-        async_add_entities(switches, update_before_add=True)
-        _LOGGER.info("Set up %d MultiTRVHeating switches for entry %s", len(switches), entry.entry_id)
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Created %d switches: %s",
+            len(switches), [switch._attr_name for switch in switches]
+        )
+    
+    # Switch states are set in the constructors; there is nothing to update before adding
+    async_add_entities(switches)
+    _LOGGER.info("Set up %d MultiTRVHeating switches for entry %s", len(switches), entry.entry_id)
@@ -22,7 +22,6 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import time
 import logging
 from typing import Optional, TYPE_CHECKING
 
@@ -44,6 +43,32 @@ HIGH_PRIORITY_MIN_OPENING = 25.0  # High priority zones trigger boiler at 25% op
 LOW_PRIORITY_MIN_OPENING = 100.0  # Low priority zones only trigger at 100% opening
 
 
+# Exported zone state: the one key table behind export_zone_state() and get_state_value()
+_ZONE_STATE_GETTERS = {
+    # Temperature information
+    "current_temperature": lambda zone: round(zone.current_temp, 2),
+    "target_temperature": lambda zone: round(zone.target_temp, 2),
+    "temperature_error": lambda zone: round(zone.current_error, 2),
+    
+    # Zone properties
+    "name": lambda zone: zone.name,
+    "floor_area_m2": lambda zone: round(zone.floor_area_m2, 2),
+    "is_high_priority": lambda zone: zone.is_high_priority,
+    
+    # Heating demand
+    "is_demanding_heat": lambda zone: zone.is_demanding_heat,
+    "trv_opening_percent": lambda zone: round(zone.trv_opening_percent, 1),
+    
+    # Temperature offset feature - exported back to Home Assistant
+    "temperature_offset": lambda zone: round(zone.temperature_offset, 1),
+    "temp_calib_entity_id": lambda zone: zone.temp_calib_entity_id,
+    
+    # External sensor (if available)
+    "has_external_sensor": lambda zone: zone.ext_temp_entity_id is not None,
+    "external_sensor_temperature": lambda zone: round(zone.ext_current_temp, 2) if zone.ext_temp_entity_id else None,
+}
+
+
 class ZoneWrapper:
     """
     Wrapper class for a single heating zone (room/area with a TRV valve).
@@ -66,6 +91,26 @@ class ZoneWrapper:
     - Reset offset to 0 when target temperature is reached
     """
 
+    __slots__ = (
+        "entity_id",
+        "name",
+        "slug",
+        "floor_area_m2",
+        "is_high_priority",
+        "current_temp",
+        "target_temp",
+        "current_error",
+        "ext_temp_entity_id",
+        "ext_current_temp",
+        "trv_position_entity_id",
+        "trv_opening_percent",
+        "is_demanding_heat",
+        "heating_status",
+        "temp_calib_entity_id",
+        "temperature_offset",
+        "master_controller",
+    )
+
     def __init__(self, entity_id: str, name: str, floor_area_m2: float = 0.0,
                  is_high_priority: bool = True, trv_position_entity_id: Optional[str] = None,
                  temp_calib_entity_id: Optional[str] = None, ext_temp_entity_id: Optional[str] = None,
@@ -86,6 +131,7 @@ class ZoneWrapper:
         # ========== Zone Identification ==========
         self.entity_id = entity_id
         self.name = name
+        self.slug = name.lower().replace(" ", "_")  # Used to build entity unique IDs
         self.floor_area_m2 = floor_area_m2
         
         # ========== Priority Configuration ==========
@@ -122,17 +168,14 @@ class ZoneWrapper:
         self.temp_calib_entity_id = temp_calib_entity_id
         self.temperature_offset = DEFAULT_TEMP_OFFSET  # Current offset (-5 to +5)
         
-        # ========== Heating Demand Logic ==========
-        # Timestamp of last temperature change (used for stability analysis)
-        self.last_update_time = time.time()
-
         self.master_controller = my_master_controller  # Reference to MasterController
         
-        _LOGGER.debug(
-            "Zone initialized: %s (entity=%s, area=%.1f m², priority=%s, position_sensor=%s, calib_entity=%s)",
-            name, entity_id, floor_area_m2, "HIGH" if is_high_priority else "LOW",
-            trv_position_entity_id or "none", temp_calib_entity_id or "none"
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Zone initialized: %s (entity=%s, area=%.1f m², priority=%s, position_sensor=%s, calib_entity=%s)",
+                name, entity_id, floor_area_m2, "HIGH" if is_high_priority else "LOW",
+                trv_position_entity_id or "none", temp_calib_entity_id or "none"
+            )
 
     def update_from_state(self, new_state) -> None:
         """
@@ -152,37 +195,47 @@ class ZoneWrapper:
         
         try:
             # Extract temperature readings from climate entity attributes
-            current = new_state.attributes.get("current_temperature")
+            attributes = new_state.attributes
+            current = attributes.get("current_temperature")
             
             # Try multiple attribute names for target temperature
-            target = new_state.attributes.get("temperature")
+            target = attributes.get("temperature")
             if target is None:
-                target = new_state.attributes.get("target_temp")
+                target = attributes.get("target_temp")
             if target is None:
                 # Fallback: try to use the state value itself
                 target = new_state.state
             
+            # Climate entities usually report floats already; only convert other types
+            current_temp = self.current_temp
             if current is not None:
-                self.current_temp = float(current)
+                current_temp = current if type(current) is float else float(current)
+            target_temp = self.target_temp
             if target is not None:
-                self.target_temp = float(target)
+                target_temp = target if type(target) is float else float(target)
+            
+            # Many climate events only change unrelated attributes (hvac_action, preset, ...)
+            # Keep the error, but still refresh demand in case priority changed
+            if current_temp == self.current_temp and target_temp == self.target_temp:
+                self._update_demand_metric()
+                return
+            self.current_temp = current_temp
+            self.target_temp = target_temp
             
             # Calculate the temperature error (how much we need to heat)
             # Positive error = zone is too cold, needs heat
             self.current_error = self.target_temp - self.current_temp
             
-            # Update timestamp for tracking stability
-            self.last_update_time = time.time()
-            
             # Recalculate demand based on new temperature state
             self._update_demand_metric()
             
-            _LOGGER.debug(
-                "Zone '%s' updated: current=%.1f°C, target=%.1f°C, error=%.1f°C, "
-                "opening=%.0f%%, demanding=%s",
-                self.name, self.current_temp, self.target_temp, self.current_error,
-                self.trv_opening_percent, self.is_demanding_heat
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Zone '%s' updated: current=%.1f°C, target=%.1f°C, error=%.1f°C, "
+                    "opening=%.0f%%, demanding=%s",
+                    self.name, self.current_temp, self.target_temp, self.current_error,
+                    self.trv_opening_percent, self.is_demanding_heat
+                )
             
         except (ValueError, TypeError, AttributeError) as e:
             _LOGGER.error("Error parsing state for zone %s: %s", self.name, e)
@@ -206,8 +259,12 @@ class ZoneWrapper:
         Args:
             opening_percent: TRV valve opening (0-100%)
         """
-        # Clamp to valid range
-        opening_percent = max(0.0, min(100.0, opening_percent))
+        # Clamp to valid range (inline conditional avoids two builtin calls per event)
+        # Written as "not >=" so that NaN also maps to 0.0
+        if not (opening_percent >= 0.0):
+            opening_percent = 0.0
+        elif opening_percent > 100.0:
+            opening_percent = 100.0
 
         update_offset = False
 
@@ -227,10 +284,11 @@ class ZoneWrapper:
 
         self.trv_opening_percent = opening_percent
         
-        _LOGGER.debug(
-            "Zone '%s': Opening updated to %.0f%%, status=%s (current=%.1f°C, target=%.1f°C)",
-            self.name, self.trv_opening_percent, self.heating_status, self.current_temp, self.target_temp
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Zone '%s': Opening updated to %.0f%%, status=%s (current=%.1f°C, target=%.1f°C)",
+                self.name, self.trv_opening_percent, self.heating_status, self.current_temp, self.target_temp
+            )
         
         # Manage temperature offset based on valve state
         if self.trv_opening_percent == 0.0:
@@ -243,10 +301,11 @@ class ZoneWrapper:
         # Recalculate demand based on new opening percentage
         self._update_demand_metric()
         
-        _LOGGER.debug(
-            "Zone '%s': TRV opening updated to %.0f%%, offset=%.1f°C",
-            self.name, self.trv_opening_percent, self.temperature_offset
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Zone '%s': TRV opening updated to %.0f%%, offset=%.1f°C",
+                self.name, self.trv_opening_percent, self.temperature_offset
+            )
         return update_offset
 
     def update_external_temperature(self, external_temp: float) -> None:
@@ -264,10 +323,11 @@ class ZoneWrapper:
             external_temp: Temperature reading from external sensor (°C)
         """
         self.ext_current_temp = float(external_temp)
-        _LOGGER.debug(
-            "Zone '%s': External temp sensor updated to %.1f°C",
-            self.name, self.ext_current_temp
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Zone '%s': External temp sensor updated to %.1f°C",
+                self.name, self.ext_current_temp
+            )
 
     def _update_demand_metric(self) -> None:
         """
@@ -290,11 +350,12 @@ class ZoneWrapper:
             # Low priority: Needs 100% opening to trigger on its own
             self.is_demanding_heat = self.trv_opening_percent >= LOW_PRIORITY_MIN_OPENING
         
-        _LOGGER.debug(
-            "Zone '%s' demand updated: priority=%s, opening=%.0f%%, demanding=%s",
-            self.name, "HIGH" if self.is_high_priority else "LOW",
-            self.trv_opening_percent, self.is_demanding_heat
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Zone '%s' demand updated: priority=%s, opening=%.0f%%, demanding=%s",
+                self.name, "HIGH" if self.is_high_priority else "LOW",
+                self.trv_opening_percent, self.is_demanding_heat
+            )
 
     def get_demand_metric(self) -> float:
         """
@@ -318,9 +379,8 @@ class ZoneWrapper:
             return 0.0
         
         # Demand is the normalized valve opening (0-100% → 0.0-1.0)
-        normalized_opening = self.trv_opening_percent / 100.0
-        
-        return max(0.0, min(1.0, normalized_opening))
+        # trv_opening_percent is clamped to 0-100 in update_trv_opening(), so no clamp here
+        return self.trv_opening_percent / 100.0
 
     def export_zone_state(self) -> dict:
         """
@@ -334,28 +394,20 @@ class ZoneWrapper:
         Returns:
             dict: Complete zone state snapshot
         """
-        state = {
-            # Temperature information
-            "current_temperature": round(self.current_temp, 2),
-            "target_temperature": round(self.target_temp, 2),
-            "temperature_error": round(self.current_error, 2),
-            
-            # Zone properties
-            "name": self.name,
-            "floor_area_m2": round(self.floor_area_m2, 2),
-            "is_high_priority": self.is_high_priority,
-            
-            # Heating demand
-            "is_demanding_heat": self.is_demanding_heat,
-            "trv_opening_percent": round(self.trv_opening_percent, 1),
-            
-            # Temperature offset feature - exported back to Home Assistant
-            "temperature_offset": round(self.temperature_offset, 1),
-            "temp_calib_entity_id": self.temp_calib_entity_id,
-            
-            # External sensor (if available)
-            "has_external_sensor": self.ext_temp_entity_id is not None,
-            "external_sensor_temperature": round(self.ext_current_temp, 2) if self.ext_temp_entity_id else None,
-        }
+        return {key: getter(self) for key, getter in _ZONE_STATE_GETTERS.items()}
+    
+    def get_state_value(self, key: str):
+        """
+        Return a single value from the exported zone state.
+        
+        Cheaper than export_zone_state() when only one metric is needed,
+        e.g. for a sensor entity reading its own value.
         
-        return state
\ No newline at end of file
+        Args:
+            key: Key of the export_zone_state() dict
+            
+        Returns:
+            The metric value, or None if the key is unknown
+        """
+        getter = _ZONE_STATE_GETTERS.get(key)
+        return getter(self) if getter is not None else None
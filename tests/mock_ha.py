@@ -83,6 +83,21 @@ class MockHass:
         self.event_listeners: list[Callable] = []
         self.data: Dict[str, Any] = {}
         self.services = MockServices()  # Add services registry
+        self.tasks: list[asyncio.Task] = []  # Tasks created via async_create_task
+    
+    def async_create_task(self, coro) -> asyncio.Task:
+        """
+        Schedule a coroutine on the running event loop, like hass.async_create_task.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The created task (also kept in self.tasks)
+        """
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.append(task)
+        return task
     
     def set_state(self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]] = None) -> None:
         """
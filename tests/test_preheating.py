@@ -17,7 +17,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_compone
 
 from zone_wrapper import ZoneWrapper
 from master_controller import MasterController
-from preheating import PreheatingController, PREHEATING_TUNING_CONSTANT, MIN_FLOW_TEMP, MAX_FLOW_TEMP
+import preheating
+from preheating import PreheatingController, PREHEATING_TUNING_CONSTANT, MIN_FLOW_TEMP, MAX_FLOW_TEMP, clamp
 
 
 class MockHomeAssistant:
@@ -331,6 +332,88 @@ class TestPreheating:
             f"Should use high-pri load only, expected ~{expected_flow}°C, got {flow_temp}°C"
         )
     
+    def test_11_override_follows_zone_changes(self):
+        """Test that the override is stable for unchanged inputs and tracks zone changes."""
+        print("\nTest 11: Pre-heating - override follows zone changes")
+        self.setup_controller()
+        
+        living = self.controller.zones['climate.living_room']
+        living.current_error = 2.0
+        
+        end_time = datetime.now() + timedelta(minutes=30)
+        self.controller.preheating.preheating_end_time = end_time
+        self.controller.preheating.is_enabled = True
+        
+        first = self.controller.preheating.calculate_flow_temp_override()
+        repeat = self.controller.preheating.calculate_flow_temp_override()
+        # Not memoized: only the elapsed time between the calls may differ
+        self.verify(abs(first - repeat) < 1e-6, f"Repeated call should return same value ({first} vs {repeat})")
+        
+        # Larger error must raise the override
+        living.current_error = 8.0
+        updated = self.controller.preheating.calculate_flow_temp_override()
+        self.verify(updated > first, f"Higher error should raise override ({updated} > {first})")
+    
+    def test_12_set_end_time_of_day_rolls_to_next_day(self):
+        """Test that an hour:minute already past today is scheduled for tomorrow."""
+        print("\nTest 12: Pre-heating - end time of day rolls over")
+        self.setup_controller()
+        
+        past = datetime.now() - timedelta(hours=1)
+        end_time = self.controller.preheating.set_end_time_of_day(past.hour, past.minute)
+        self.verify(end_time > datetime.now(), f"End time should be in the future, got {end_time}")
+        self.verify(
+            (end_time.hour, end_time.minute) == (past.hour, past.minute),
+            f"End time should keep {past.hour:02d}:{past.minute:02d}, got {end_time:%H:%M}"
+        )
+        self.verify(
+            self.controller.preheating.preheating_end_time == end_time,
+            "Controller end time should be updated"
+        )
+    
+    def test_13_end_time_follows_wall_clock_steps(self):
+        """Test that a wall-clock step after setting the end time is honoured."""
+        print("\nTest 13: Pre-heating - end time follows wall-clock steps")
+        self.setup_controller()
+        
+        self.controller.preheating.preheating_end_time = datetime.now() + timedelta(minutes=30)
+        self.controller.preheating.is_enabled = True
+        
+        real_time = preheating.time
+        
+        class SteppedClock:
+            """time module stand-in whose wall clock jumped one hour forward."""
+            
+            @staticmethod
+            def time():
+                return real_time.time() + 3600
+        
+        preheating.time = SteppedClock
+        try:
+            active = self.controller.preheating.is_active()
+        finally:
+            preheating.time = real_time
+        self.verify(not active, "Pre-heating should end once the wall clock passes the end time")
+    
+    def test_14_clamp_bounds_and_nan(self):
+        """Test that clamp limits values and maps NaN to the lower bound."""
+        print("\nTest 14: Pre-heating - clamp bounds and NaN")
+        self.verify(clamp(-1.0, 0.0, 500.0) == 0.0, "Below range should clamp to low")
+        self.verify(clamp(600.0, 0.0, 500.0) == 500.0, "Above range should clamp to high")
+        self.verify(clamp(42.5, 0.0, 500.0) == 42.5, "In-range value should pass through")
+        self.verify(clamp(float("nan"), 0.0, 500.0) == 0.0, "NaN should clamp to low")
+        
+        # A NaN thermal load must not produce a NaN flow temperature
+        self.setup_controller()
+        living = self.controller.zones['climate.living_room']
+        living.current_error = 2.0
+        living.floor_area_m2 = float("nan")
+        self.controller.preheating.preheating_end_time = datetime.now() + timedelta(minutes=30)
+        self.controller.preheating.is_enabled = True
+        flow_temp = self.controller.preheating.calculate_flow_temp_override()
+        self.verify(MIN_FLOW_TEMP <= flow_temp <= MAX_FLOW_TEMP,
+                    f"Flow temperature should stay in range with a NaN load, got {flow_temp}")
+    
     def run_all_tests(self):
         """Run all pre-heating tests."""
         print("\n" + "="*80)
@@ -347,6 +430,10 @@ class TestPreheating:
         self.test_8_preheating_flow_temp_aggressive_with_less_time()
         self.test_9_preheating_maxes_out_with_large_thermal_load()
         self.test_10_preheating_ignores_low_priority_in_override()
+        self.test_11_override_follows_zone_changes()
+        self.test_12_set_end_time_of_day_rolls_to_next_day()
+        self.test_13_end_time_follows_wall_clock_steps()
+        self.test_14_clamp_bounds_and_nan()
         
         print("\n" + "="*80)
         print(f"RESULTS: {self.passed} passed, {self.failed} failed")
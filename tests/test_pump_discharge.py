@@ -16,9 +16,44 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from zone_wrapper import ZoneWrapper
 from master_controller import MasterController
+import pump_discharge
 from pump_discharge import PumpDischargeController, PUMP_DISCHARGE_TIMEOUT
 from test_logger import create_test_logger, TestLogger
-from mock_ha import MockHass, MockClimateEntity, MockState
+from mock_ha import MockHass, MockClimateEntity, MockState, MockEvent
+
+
+class _FakeStateTracker:
+    """Stand-in for async_track_state_change_event that records subscriptions."""
+    
+    def __init__(self):
+        self.action = None
+        self.entity_ids = None
+        self.unsubscribed = 0
+    
+    def __call__(self, hass, entity_ids, action):
+        self.entity_ids = list(entity_ids)
+        self.action = action
+        return self._unsubscribe
+    
+    def _unsubscribe(self):
+        self.unsubscribed += 1
+
+
+class _FakeCallLater:
+    """Stand-in for async_call_later that records scheduled callbacks."""
+    
+    def __init__(self):
+        self.delay = None
+        self.action = None
+        self.cancelled = 0
+    
+    def __call__(self, hass, delay, action):
+        self.delay = delay
+        self.action = action
+        return self._cancel
+    
+    def _cancel(self):
+        self.cancelled += 1
 
 
 class PumpDischargeTestSuite:
@@ -46,6 +81,13 @@ class PumpDischargeTestSuite:
             await self.test_discharge_entity_configuration()
             await self.test_discharge_with_multiple_zones()
             await self.test_discharge_prevents_pump_trapping()
+            await self.test_concurrent_enable_calls_switch_once()
+            await self.test_switch_off_transition_stops_discharge()
+            await self.test_teardown_releases_switch_listener()
+            await self.test_scheduled_timeout_disables_discharge()
+            await self.test_timeout_cancelled_when_discharge_ends()
+            await self.test_polled_timeout_fallback()
+            await self.test_unchanged_config_keeps_subscription()
             
             self._print_summary()
         except Exception as e:
@@ -333,6 +375,266 @@ class PumpDischargeTestSuite:
             self.log.warning(f"Test failed: {e}")
             self.failed_tests += 1
     
+    async def test_concurrent_enable_calls_switch_once(self) -> None:
+        """Test that overlapping enable requests only turn the switch on once."""
+        test_name = "Concurrent Enable Calls Switch Once"
+        self.log.test_case(test_name, "Verify state is flipped before the service call is awaited")
+        
+        try:
+            self.log.step(1, "Create discharge controller with a service call that yields")
+            mock_hass = MockHass()
+            record_call = mock_hass.services.async_call
+            
+            async def yielding_call(*args, **kwargs):
+                await asyncio.sleep(0)
+                await record_call(*args, **kwargs)
+            
+            mock_hass.services.async_call = yielding_call
+            discharge = PumpDischargeController(mock_hass, 'climate.zone_a', 'Zone A')
+            
+            self.log.step(2, "Enable discharge twice concurrently")
+            await asyncio.gather(discharge._enable_discharge(), discharge._enable_discharge())
+            
+            turn_on_calls = [c for c in mock_hass.services.calls if c['service'] == 'turn_on']
+            if len(turn_on_calls) == 1 and discharge.is_discharging:
+                self.log.verify(True, "Switch turned on exactly once")
+                self.passed_tests += 1
+            else:
+                self.log.verify(False, f"Expected 1 turn_on call, got {len(turn_on_calls)}")
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+    
+    async def test_switch_off_transition_stops_discharge(self) -> None:
+        """Test that only a real on -> off switch transition ends the discharge."""
+        test_name = "Switch Off Transition Stops Discharge"
+        self.log.test_case(test_name, "Verify off->off and attribute-only events are ignored")
+        
+        original_tracker = pump_discharge.async_track_state_change_event
+        tracker = _FakeStateTracker()
+        pump_discharge.async_track_state_change_event = tracker
+        try:
+            self.log.step(1, "Create discharge controller and start discharge")
+            mock_hass = MockHass()
+            discharge = PumpDischargeController(mock_hass, 'climate.zone_a', 'Zone A')
+            await discharge._enable_discharge()
+            switch_id = 'switch.zone_a_boost_heating'
+            
+            def fire(old, new, attributes=None):
+                tracker.action(MockEvent(data={
+                    'entity_id': switch_id,
+                    'old_state': MockState(switch_id, old, {}) if old else None,
+                    'new_state': MockState(switch_id, new, attributes or {}),
+                }))
+            
+            self.log.step(2, "Fire off->off, attribute-only and on->on events")
+            fire('off', 'off')
+            fire('off', 'off', {'friendly_name': 'Zone A Boost'})
+            fire('on', 'on', {'friendly_name': 'Zone A Boost'})
+            fire(None, 'off')
+            still_discharging = discharge.is_discharging
+            
+            self.log.step(3, "Fire on->off event")
+            fire('on', 'off')
+            
+            if tracker.entity_ids == [switch_id] and still_discharging and not discharge.is_discharging:
+                self.log.verify(True, "Discharge ended only on the on->off transition")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"Unexpected state: tracked={tracker.entity_ids}, "
+                    f"after_ignored={still_discharging}, after_off={discharge.is_discharging}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_track_state_change_event = original_tracker
+    
+    async def test_teardown_releases_switch_listener(self) -> None:
+        """Test that teardown unsubscribes the switch listener and cancels the timeout."""
+        test_name = "Teardown Releases Switch Listener"
+        self.log.test_case(test_name, "Verify async_teardown releases subscriptions")
+        
+        original_tracker = pump_discharge.async_track_state_change_event
+        tracker = _FakeStateTracker()
+        pump_discharge.async_track_state_change_event = tracker
+        try:
+            self.log.step(1, "Create discharge controller with a pending timeout")
+            discharge = PumpDischargeController(MockHass(), 'climate.zone_a', 'Zone A')
+            cancelled = []
+            discharge._cancel_timeout = lambda: cancelled.append(True)
+            
+            self.log.step(2, "Tear down twice")
+            discharge.async_teardown()
+            discharge.async_teardown()
+            
+            if tracker.unsubscribed == 1 and cancelled == [True] and discharge._cancel_timeout is None:
+                self.log.verify(True, "Listener and timeout released exactly once")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"unsubscribed={tracker.unsubscribed}, cancelled={len(cancelled)}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_track_state_change_event = original_tracker
+    
+    async def test_scheduled_timeout_disables_discharge(self) -> None:
+        """Test that the scheduled timeout fires and turns the switch off."""
+        test_name = "Scheduled Timeout Disables Discharge"
+        self.log.test_case(test_name, "Verify async_call_later schedules _on_timeout, which disables the switch")
+        
+        original_call_later = pump_discharge.async_call_later
+        call_later = _FakeCallLater()
+        pump_discharge.async_call_later = call_later
+        try:
+            self.log.step(1, "Start discharge")
+            mock_hass = MockHass()
+            discharge = PumpDischargeController(mock_hass, 'climate.zone_a', 'Zone A')
+            await discharge._enable_discharge()
+            scheduled = call_later.delay == PUMP_DISCHARGE_TIMEOUT and discharge._cancel_timeout is not None
+            
+            self.log.step(2, "Fire the timeout callback")
+            call_later.action(None)
+            await asyncio.gather(*mock_hass.tasks)
+            
+            turn_off_calls = [c for c in mock_hass.services.calls if c['service'] == 'turn_off']
+            if scheduled and len(turn_off_calls) == 1 and not discharge.is_discharging \
+                    and discharge._cancel_timeout is None:
+                self.log.verify(True, "Timeout scheduled, fired and switch turned off")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"scheduled={scheduled}, turn_off={len(turn_off_calls)}, "
+                    f"discharging={discharge.is_discharging}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_call_later = original_call_later
+    
+    async def test_timeout_cancelled_when_discharge_ends(self) -> None:
+        """Test that the scheduled timeout is cancelled when discharge ends early."""
+        test_name = "Timeout Cancelled When Discharge Ends"
+        self.log.test_case(test_name, "Verify boiler reactivation and _disable_discharge cancel the timeout")
+        
+        original_call_later = pump_discharge.async_call_later
+        call_later = _FakeCallLater()
+        pump_discharge.async_call_later = call_later
+        try:
+            self.log.step(1, "Start discharge, then reactivate the boiler (Case 1)")
+            discharge = PumpDischargeController(MockHass(), 'climate.zone_a', 'Zone A')
+            await discharge._enable_discharge()
+            await discharge.evaluate_and_update(boiler_should_be_on=True)
+            cancelled_by_boiler = call_later.cancelled
+            
+            self.log.step(2, "Start discharge again, then disable it directly")
+            await discharge._enable_discharge()
+            await discharge._disable_discharge()
+            
+            if cancelled_by_boiler == 1 and call_later.cancelled == 2 \
+                    and discharge._cancel_timeout is None and not discharge.is_discharging:
+                self.log.verify(True, "Timeout cancelled in both paths")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"cancelled after boiler={cancelled_by_boiler}, total={call_later.cancelled}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_call_later = original_call_later
+    
+    async def test_polled_timeout_fallback(self) -> None:
+        """Test that discharge still ends when no timeout could be scheduled."""
+        test_name = "Polled Timeout Fallback"
+        self.log.test_case(test_name, "Verify evaluate_and_update ends an expired discharge")
+        
+        original_call_later = pump_discharge.async_call_later
+        pump_discharge.async_call_later = None
+        try:
+            self.log.step(1, "Start discharge without async_call_later")
+            mock_hass = MockHass()
+            discharge = PumpDischargeController(mock_hass, 'climate.zone_a', 'Zone A')
+            discharge.boiler_was_on = True
+            await discharge.evaluate_and_update(boiler_should_be_on=False)
+            
+            self.log.step(2, "Evaluate before and after the timeout has elapsed")
+            await discharge.evaluate_and_update(boiler_should_be_on=False)
+            still_discharging = discharge.is_discharging
+            discharge.discharge_start_time -= PUMP_DISCHARGE_TIMEOUT + 1
+            await discharge.evaluate_and_update(boiler_should_be_on=False)
+            
+            if still_discharging and not discharge.is_discharging:
+                self.log.verify(True, "Expired discharge disabled on the next evaluation")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"before timeout={still_discharging}, after timeout={discharge.is_discharging}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_call_later = original_call_later
+    
+    async def test_unchanged_config_keeps_subscription(self) -> None:
+        """Test that re-applying the same discharge TRV does not resubscribe."""
+        test_name = "Unchanged Config Keeps Subscription"
+        self.log.test_case(test_name, "Verify update_config is a no-op for unchanged settings")
+        
+        original_tracker = pump_discharge.async_track_state_change_event
+        tracker = _FakeStateTracker()
+        pump_discharge.async_track_state_change_event = tracker
+        try:
+            self.log.step(1, "Configure the same discharge TRV again")
+            discharge = PumpDischargeController(MockHass(), 'climate.zone_a', 'Zone A')
+            discharge.update_config('climate.zone_a', 'Zone A')
+            unchanged_unsubscribed = tracker.unsubscribed
+            
+            self.log.step(2, "Configure a different discharge TRV")
+            discharge.update_config('climate.zone_b', 'Zone B')
+            
+            if unchanged_unsubscribed == 0 and tracker.unsubscribed == 1 \
+                    and tracker.entity_ids == ['switch.zone_b_boost_heating']:
+                self.log.verify(True, "Only a changed TRV resubscribes the switch listener")
+                self.passed_tests += 1
+            else:
+                self.log.verify(
+                    False,
+                    f"unsubscribed after same={unchanged_unsubscribed}, after change={tracker.unsubscribed}, "
+                    f"tracked={tracker.entity_ids}"
+                )
+                self.failed_tests += 1
+        
+        except Exception as e:
+            self.log.warning(f"Test failed: {e}")
+            self.failed_tests += 1
+        finally:
+            pump_discharge.async_track_state_change_event = original_tracker
+    
     def _print_summary(self) -> None:
         """Print test summary."""
         total = self.passed_tests + self.failed_tests
@@ -7,15 +7,81 @@ expose controller and zone state for monitoring and visualization.
 
 import sys
 import os
+import importlib
+import types
 
 # Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'multi_trv_heating'))
+COMPONENT_DIR = os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'multi_trv_heating')
+sys.path.insert(0, COMPONENT_DIR)
 
 from master_controller import MasterController
 from sensor import (
     MultiTRVHeatingSensor, ControllerSensor, ZoneSensor,
     MultiTRVHeatingEntityManager, _UNIT_TEMP, _UNIT_PERCENT
 )
+from storage import StateStorage, SAVE_DELAY
+
+
+def run_coroutine(coro):
+    """
+    Run a coroutine that never suspends and return its result.
+    
+    The suite may already be running inside an event loop, so the
+    coroutine is driven directly instead of through asyncio.run().
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Coroutine suspended; run_coroutine only supports non-suspending code")
+
+
+def import_platform(name):
+    """
+    Import a platform module (number, select, switch) that uses relative imports.
+    
+    The real package __init__ needs Home Assistant, so a bare package exposing
+    only DOMAIN stands in for it. Note that the platforms then use
+    multi_trv_heating.storage, not the top-level storage module.
+    """
+    if "multi_trv_heating" not in sys.modules:
+        package = types.ModuleType("multi_trv_heating")
+        package.__path__ = [COMPONENT_DIR]
+        package.DOMAIN = "multi_trv_heating"
+        sys.modules["multi_trv_heating"] = package
+    return importlib.import_module(f"multi_trv_heating.{name}")
+
+
+class EntityHarness:
+    """
+    Entity base methods missing when the platforms fall back to object.
+    
+    Mix in after the entity class so super() calls reach these stand-ins.
+    """
+    
+    state_writes = 0
+    
+    async def async_added_to_hass(self):
+        pass
+    
+    def async_write_ha_state(self):
+        self.state_writes += 1
+
+
+def with_harness(entity_class):
+    """Return entity_class extended with EntityHarness."""
+    return type(entity_class.__name__, (entity_class, EntityHarness), {})
+
+
+class MockStore:
+    """Mock Home Assistant Store recording delayed saves."""
+    
+    def __init__(self):
+        self.delay_saves = []
+    
+    def async_delay_save(self, data_func, delay):
+        self.delay_saves.append((data_func, delay))
 
 
 class MockHomeAssistant:
@@ -324,6 +390,252 @@ class TestSensors:
             f"Should have sensors with icons (got {len(sensors_with_icons)}/{len(sensors)})"
         )
     
+    def test_13_listener_writes_only_changed_values(self):
+        """Test controller listeners push state only when the value changed."""
+        print("\nTest 13: Listener writes only changed values")
+        self.setup_controller()
+        
+        zone = self.controller.zones['climate.living_room']
+        sensor = ZoneSensor(
+            zone_name="Living Room",
+            metric_name="Current Temperature",
+            metric_key="current_temperature"
+        )
+        sensor.zone = zone
+        
+        writes = []
+        sensor.async_write_ha_state = lambda: writes.append(sensor.state)
+        remove_listener = self.controller.async_add_listener(sensor._handle_update)
+        
+        zone.current_temp = 21.0
+        self.controller.async_update_listeners()
+        self.controller.async_update_listeners()
+        self.verify(writes == [21.0], f"Unchanged value should be written once, got {writes}")
+        
+        zone.current_temp = 21.5
+        self.controller.async_update_listeners()
+        self.verify(writes == [21.0, 21.5], f"Changed value should be written, got {writes}")
+        
+        remove_listener()
+        zone.current_temp = 22.0
+        self.controller.async_update_listeners()
+        self.verify(len(writes) == 2, "Removed listener should not be called")
+    
+    def test_14_listeners_notified_when_command_fails(self):
+        """Test zone updates reach listeners even if the boiler command raises."""
+        print("\nTest 14: Listeners notified when boiler command fails")
+        self.setup_controller()
+        
+        notified = []
+        self.controller.async_add_listener(lambda: notified.append(
+            self.controller.zones['climate.living_room'].current_temp
+        ))
+        
+        async def failing_command():
+            raise RuntimeError("service validation error")
+        
+        self.controller._calculate_and_command = failing_command
+        
+        class State:
+            state = "heat"
+            attributes = {"current_temperature": 18.5, "temperature": 21.0}
+        
+        class Event:
+            data = {"entity_id": "climate.living_room", "new_state": State()}
+        
+        try:
+            run_coroutine(self.controller._async_climate_state_change(Event()))
+            raised = False
+        except RuntimeError:
+            raised = True
+        
+        self.verify(raised, "Command error should propagate")
+        self.verify(notified and notified[0] == 18.5,
+                    f"Listeners should see the zone update before the command, got {notified}")
+    
+    def test_15_state_value_matches_export(self):
+        """Test single-value reads agree with the full zone export."""
+        print("\nTest 15: get_state_value matches export_zone_state")
+        self.setup_controller()
+        
+        zone = self.controller.zones['climate.living_room']
+        zone.current_temp = 19.126
+        zone.current_error = 1.874
+        exported = zone.export_zone_state()
+        mismatched = [key for key, value in exported.items() if zone.get_state_value(key) != value]
+        self.verify(not mismatched, f"Values should match the export, mismatched: {mismatched}")
+        self.verify(zone.get_state_value("unknown_key") is None, "Unknown key should return None")
+    
+    def test_16_storage_delay_save(self):
+        """Test that delayed saves set the value and schedule one coalesced write."""
+        print("\nTest 16: Storage set and delay save")
+        
+        storage = StateStorage()
+        storage.async_set_and_delay_save("key", 1.5)
+        self.verify(storage.get("key") == 1.5, "Value should be set without a store")
+        
+        store = MockStore()
+        storage.store = store
+        storage.async_set_and_delay_save("key", 2.5)
+        self.verify(storage.get("key") == 2.5, "Value should be set with a store")
+        self.verify(len(store.delay_saves) == 1, f"One delayed save expected, got {len(store.delay_saves)}")
+        data_func, delay = store.delay_saves[0]
+        self.verify(delay == SAVE_DELAY, f"Delay should be SAVE_DELAY ({SAVE_DELAY}), got {delay}")
+        self.verify(data_func() == {"key": 2.5}, f"Saved data should be the stored state, got {data_func()}")
+    
+    def _install_platform_storage(self, data=None):
+        """Install a platform StateStorage backed by a MockStore; return both."""
+        platform_storage = import_platform("storage")
+        storage = platform_storage.StateStorage()
+        storage.store = MockStore()
+        storage.data = dict(data or {})
+        platform_storage.set_storage(storage)
+        return platform_storage, storage
+    
+    def test_17_number_restore_and_dedup(self):
+        """Test number entities restore stored values and skip unchanged writes."""
+        print("\nTest 17: Number entities restore and skip unchanged values")
+        self.setup_controller()
+        number = import_platform("number")
+        zone = self.controller.zones['climate.living_room']
+        area_id = f"entry_multi_trv_{zone.slug}_area_m2"
+        hour_id = "entry_multi_trv_preheating_end_hour"
+        platform_storage, storage = self._install_platform_storage({
+            f"zone_floor_area_{area_id}": 55.0,
+            f"preheating_end_hour_{hour_id}": 6,
+        })
+        try:
+            notified = []
+            self.controller.async_add_listener(lambda: notified.append(zone.floor_area_m2))
+            area = with_harness(number.ZoneAreaNumber)(zone.name, zone.entity_id, zone, "entry")
+            self.verify(zone.floor_area_m2 == 40.0, "Area should not be restored before the entity is added")
+            run_coroutine(area.async_added_to_hass())
+            self.verify(zone.floor_area_m2 == 55.0 and area.native_value == 55.0,
+                        f"Area should be restored to 55.0, got {zone.floor_area_m2}")
+            self.verify(notified == [55.0], f"Listeners should see the restored area, got {notified}")
+            
+            run_coroutine(area.async_set_native_value(55.0))
+            self.verify(area.state_writes == 0 and not storage.store.delay_saves,
+                        "Unchanged area should not write or save")
+            run_coroutine(area.async_set_native_value(60.0))
+            self.verify(area.state_writes == 1 and len(storage.store.delay_saves) == 1,
+                        "Changed area should write and save once")
+            self.verify(storage.get(f"zone_floor_area_{area_id}") == 60.0, "Changed area should be stored")
+            run_coroutine(area.async_set_native_value(float("nan")))
+            self.verify(zone.floor_area_m2 == 0.0 and storage.get(f"zone_floor_area_{area_id}") == 0.0,
+                        f"NaN area should clamp to 0.0, got {zone.floor_area_m2}")
+            
+            storage.set(f"zone_floor_area_{area_id}", "nan")
+            restored = with_harness(number.ZoneAreaNumber)(zone.name, zone.entity_id, zone, "entry")
+            zone.floor_area_m2 = 40.0
+            run_coroutine(restored.async_added_to_hass())
+            self.verify(zone.floor_area_m2 == 0.0, f"Stored \"nan\" should restore as 0.0, got {zone.floor_area_m2}")
+            storage.store.delay_saves.clear()
+            
+            hour = with_harness(number.PreheatingEndTimeHour)(self.controller, "entry")
+            run_coroutine(hour.async_added_to_hass())
+            end_time = self.controller.preheating.preheating_end_time
+            self.verify(end_time is not None and end_time.hour == 6,
+                        f"End hour should be restored to 6, got {end_time}")
+            run_coroutine(hour.async_set_native_value(6))
+            self.verify(hour.state_writes == 0 and not storage.store.delay_saves,
+                        "Unchanged hour should not write or save")
+            run_coroutine(hour.async_set_native_value(7))
+            self.verify(hour.state_writes == 1 and storage.get(f"preheating_end_hour_{hour_id}") == 7,
+                        "Changed hour should write and save")
+        finally:
+            platform_storage.set_storage(None)
+    
+    def test_18_select_restore_and_dedup(self):
+        """Test the discharge select restores its option and skips unchanged writes."""
+        print("\nTest 18: Discharge select restores and skips unchanged options")
+        self.setup_controller()
+        select = import_platform("select")
+        unique_id = "entry_discharge_trv_select"
+        platform_storage, storage = self._install_platform_storage({
+            f"discharge_trv_select_{unique_id}": "Bedroom",
+        })
+        try:
+            selector = with_harness(select.DischargeTRVSelect)(self.controller, "entry")
+            discharge = self.controller.pump_discharge
+            self.verify(selector.current_option == "Bedroom", "Stored option should be restored")
+            self.verify(discharge.discharge_trv_entity_id == "climate.bedroom",
+                        "Restored option should configure the discharge TRV")
+            
+            run_coroutine(selector.async_select_option("Bedroom"))
+            selector.hass = self.hass
+            selector.entity_id = "select.discharge_trv"
+            selector._update_current_option()
+            self.verify(selector.state_writes == 0 and not storage.store.delay_saves,
+                        "Unchanged option should not write or save")
+            
+            run_coroutine(selector.async_select_option("Off"))
+            self.verify(selector.state_writes == 1 and len(storage.store.delay_saves) == 1,
+                        "Changed option should write and save once")
+            self.verify(discharge.discharge_trv_entity_id is None, "Off should clear the discharge TRV")
+        finally:
+            platform_storage.set_storage(None)
+    
+    def test_19_switch_restore_and_dedup(self):
+        """Test switches restore stored states and skip unchanged toggles."""
+        print("\nTest 19: Switches restore and skip unchanged toggles")
+        self.setup_controller()
+        switch = import_platform("switch")
+        zone = self.controller.zones['climate.living_room']
+        priority_id = f"entry_multi_trv_{zone.slug}_priority_switch"
+        platform_storage, storage = self._install_platform_storage({
+            f"zone_priority_{priority_id}": False,
+        })
+        try:
+            priority = with_harness(switch.ZonePrioritySwitch)(zone.name, zone.entity_id, zone, "entry")
+            self.verify(priority._attr_is_on is False and zone.is_high_priority is False,
+                        "Stored low priority should be restored")
+            
+            run_coroutine(priority.async_turn_off())
+            self.verify(priority.state_writes == 0 and not storage.store.delay_saves,
+                        "Unchanged priority should not write or save")
+            run_coroutine(priority.async_turn_on())
+            self.verify(priority.state_writes == 1 and zone.is_high_priority is True,
+                        "Changed priority should write state")
+            self.verify(storage.get(f"zone_priority_{priority_id}") is True
+                        and len(storage.store.delay_saves) == 1,
+                        "Changed priority should be saved")
+            
+            component = with_harness(switch.ComponentEnableSwitch)(self.controller, "entry")
+            run_coroutine(component.async_turn_on())
+            self.verify(component.state_writes == 0 and len(storage.store.delay_saves) == 1,
+                        "Enabling an enabled component should not write or save")
+        finally:
+            platform_storage.set_storage(None)
+    
+    def test_20_external_sensor_metric_only_with_sensor(self):
+        """Test that the external sensor temperature sensor exists only for zones with a sensor."""
+        print("\nTest 20: External sensor temperature only for zones with an external sensor")
+        zone_configs = [
+            {
+                'entity_id': 'climate.study',
+                'name': 'Study',
+                'area': 12.0,
+                'ext_temp_entity_id': 'sensor.study_temperature'
+            },
+            {
+                'entity_id': 'climate.hall',
+                'name': 'Hall',
+                'area': 8.0
+            }
+        ]
+        self.controller = MasterController(self.hass, zone_configs)
+        manager = MultiTRVHeatingEntityManager(self.controller)
+        
+        study_keys = {sensor.metric_key for sensor in manager.zone_sensors['climate.study']}
+        hall_keys = {sensor.metric_key for sensor in manager.zone_sensors['climate.hall']}
+        self.verify("external_sensor_temperature" in study_keys,
+                    "Zone with an external sensor should get the external temperature sensor")
+        self.verify("external_sensor_temperature" not in hall_keys,
+                    "Zone without an external sensor should not get the external temperature sensor")
+        self.verify("has_external_sensor" in study_keys and "has_external_sensor" in hall_keys,
+                    "Both zones should keep the has-external-sensor flag")
+    
     def run_all_tests(self):
         """Run all sensor tests."""
         print("\n" + "="*80)
@@ -342,6 +654,14 @@ class TestSensors:
         self.test_10_manager_update_all_sensors()
         self.test_11_sensor_units()
         self.test_12_sensor_icons()
+        self.test_13_listener_writes_only_changed_values()
+        self.test_14_listeners_notified_when_command_fails()
+        self.test_15_state_value_matches_export()
+        self.test_16_storage_delay_save()
+        self.test_17_number_restore_and_dedup()
+        self.test_18_select_restore_and_dedup()
+        self.test_19_switch_restore_and_dedup()
+        self.test_20_external_sensor_metric_only_with_sensor()
         
         print("\n" + "="*80)
         print(f"RESULTS: {self.passed} passed, {self.failed} failed")
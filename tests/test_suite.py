@@ -68,6 +68,7 @@ class TestSuite:
             await self.test_zone_at_target_temperature()
             await self.test_zero_opening_all_zones()
             await self.test_rapid_state_changes()
+            await self.test_trv_opening_clamped()
             
             # Realistic scenario
             await self.test_realistic_house_scenario()
@@ -612,6 +613,35 @@ class TestSuite:
             self.log.warning(str(e))
             self.failed_tests += 1
     
+    async def test_trv_opening_clamped(self) -> None:
+        """
+        Test: Out-of-range and NaN valve openings are clamped to [0, 100]
+        
+        Scenario: Position sensor reports -5%, 150% and NaN
+        Expected: Opening becomes 0%, 100% and 0% respectively
+        """
+        self.log.test_case(
+            "TRV Opening Clamped",
+            "Verify that invalid valve openings, including NaN, are clamped to 0-100%."
+        )
+        
+        try:
+            zone = ZoneWrapper("climate.room", "Test Room", is_high_priority=True)
+            for reported, expected in ((-5.0, 0.0), (150.0, 100.0), (float("nan"), 0.0)):
+                self.log.step(1, f"Report {reported}% opening")
+                zone.update_trv_opening(reported)
+                self.log.verify(
+                    zone.trv_opening_percent == expected,
+                    f"Opening {reported}% should clamp to {expected}%, got {zone.trv_opening_percent}%"
+                )
+            
+            self.log.info("Test PASSED: Valve opening is clamped")
+            self.passed_tests += 1
+            
+        except AssertionError as e:
+            self.log.warning(str(e))
+            self.failed_tests += 1
+    
     async def test_zero_opening_all_zones(self) -> None:
         """
         Test: All zones closed (0% opening)